@@ -0,0 +1,153 @@
+"""
+Benchmarks startup time and throughput of the duplicate detection pipeline.
+
+Startup is measured with `python -X importtime` in fresh interpreters, so it reflects what a
+short-lived worker process pays before doing any work. Throughput is measured on synthetic
+contacts. Both are reported together so regressions in either show up in the same run.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--contacts 1000] [--repeat 5] [--json results.json]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import string
+import subprocess
+import sys
+import time
+
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+STARTUP_MODULE = "match_score_evaluator.duplicate_finder"
+HEAVY_DEPENDENCIES = ("polars", "numpy", "rapidfuzz")
+
+
+def measure_startup(module: str, repeat: int) -> dict[str, object]:
+    """
+    Imports a module in fresh interpreters and reports its cumulative import time.
+
+    Parameters:
+    - module (str): The module to import.
+    - repeat (int): The number of interpreters to start; the median is reported.
+
+    Returns:
+    - dict: The median import time in milliseconds, the modules with the highest self time among
+      those imported by the module in the last run, and the heavy dependencies that were loaded.
+    """
+    check = f"import sys, {module}; print(','.join(name for name in {HEAVY_DEPENDENCIES!r} if name in sys.modules))"
+    environment = {**os.environ, "PYTHONPATH": SOURCE_DIR}
+
+    timings = []
+    imported_modules: list[tuple[int, str]] = []
+    loaded_dependencies = ""
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, "-X", "importtime", "-c", check], env=environment,
+                                   capture_output=True, text=True, check=True)
+        loaded_dependencies = completed.stdout.strip()
+        # Modules are reported once fully imported, so those pulled in by the benchmarked module are
+        # the nested (indented) entries listed right before it.
+        imported_modules = []
+        for line in completed.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            self_time, cumulative_time, name = line[len("import time:"):].split("|")
+            if name.strip() == module:
+                imported_modules.append((int(self_time), module))
+                timings.append(int(cumulative_time) / 1000)
+                break
+            if name.startswith("  "):
+                imported_modules.append((int(self_time), name.strip()))
+            else:
+                imported_modules = []
+
+    slowest = sorted(imported_modules, reverse=True)[:10]
+    return {
+        "module": module,
+        "import_ms": statistics.median(timings),
+        "slowest_modules_ms": {name: self_time / 1000 for self_time, name in slowest},
+        "heavy_dependencies_loaded": [name for name in loaded_dependencies.split(",") if name]
+    }
+
+
+def measure_throughput(num_contacts: int, repeat: int) -> dict[str, object]:
+    """
+    Runs `find_duplicates` on synthetic contacts and reports the number of pairs scored per second.
+
+    Parameters:
+    - num_contacts (int): The number of synthetic contacts.
+    - repeat (int): The number of runs; the best run is reported.
+
+    Returns:
+    - dict: The number of pairs, the best run time in seconds and the resulting pairs per second.
+    """
+    sys.path.insert(0, SOURCE_DIR)
+    import polars as pl
+    from match_score_evaluator.contact_comparator import ContactComparator
+    from match_score_evaluator.duplicate_finder import DuplicateFinder
+    from match_score_evaluator.similarity_factory import StrategyRegistry
+    from match_score_evaluator.strategies import (
+        NameSimilarity,
+        EmailSimilarity,
+        ZipCodeSimilarity,
+        AddressSimilarity
+    )
+
+    generator = random.Random(0)
+
+    def word(length: int) -> str:
+        return "".join(generator.choices(string.ascii_lowercase, k=length)).capitalize()
+
+    contacts = pl.DataFrame({
+        "Contact ID": list(range(num_contacts)),
+        "First Name": [word(generator.randint(3, 8)) for _ in range(num_contacts)],
+        "Last Name": [word(generator.randint(3, 10)) for _ in range(num_contacts)],
+        "Email Address": [f"{word(8).lower()}@example.com" for _ in range(num_contacts)],
+        "Zip Code": [f"{generator.randint(0, 99):05d}" for _ in range(num_contacts)],
+        "Address": [f"{generator.randint(1, 999)} {word(6)} St" for _ in range(num_contacts)]
+    })
+    registry = StrategyRegistry({
+        "First Name": NameSimilarity(),
+        "Last Name": NameSimilarity(),
+        "Email Address": EmailSimilarity(),
+        "Zip Code": ZipCodeSimilarity(),
+        "Address": AddressSimilarity()
+    })
+    weights = {"First Name": 0.2, "Last Name": 0.2, "Email Address": 0.4, "Zip Code": 0.1, "Address": 0.1}
+    finder = DuplicateFinder(ContactComparator(weights, registry))
+
+    timings = []
+    pairs = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pairs = finder.find_duplicates(contacts).height
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    return {"contacts": num_contacts, "pairs": pairs, "seconds": best, "pairs_per_second": pairs / best}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark startup time and throughput of the pipeline.")
+    parser.add_argument("--contacts", type=int, default=1000, help="Number of synthetic contacts.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of repetitions per measurement.")
+    parser.add_argument("--json", help="Optional path to write the results to as JSON.")
+    arguments = parser.parse_args()
+
+    results = {
+        "startup": measure_startup(STARTUP_MODULE, arguments.repeat),
+        "throughput": measure_throughput(arguments.contacts, arguments.repeat)
+    }
+
+    startup = results["startup"]
+    throughput = results["throughput"]
+    print(f"Startup: import {startup['module']} in {startup['import_ms']:.1f} ms "
+          f"(heavy dependencies loaded: {', '.join(startup['heavy_dependencies_loaded']) or 'none'})")
+    for name, milliseconds in startup["slowest_modules_ms"].items():
+        print(f"  {milliseconds:8.2f} ms  {name}")
+    print(f"Throughput: {throughput['pairs']} pairs in {throughput['seconds']:.3f} s "
+          f"({throughput['pairs_per_second']:,.0f} pairs/s)")
+
+    if arguments.json:
+        with open(arguments.json, "w") as output_file:
+            json.dump(results, output_file, indent=2)
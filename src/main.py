@@ -1,7 +1,9 @@
 import logging
+import os
 from match_score_evaluator.contact_comparator import ContactComparator
 from match_score_evaluator.duplicate_finder import DuplicateFinder
-from match_score_evaluator.similarity_factory import SimilarityStrategyFactory
+from match_score_evaluator.profiling import Profiler
+from match_score_evaluator.similarity_factory import StrategyRegistry
 from match_score_evaluator.strategies import (
     NameSimilarity,
     EmailSimilarity,
@@ -45,16 +47,13 @@ if __name__ == '__main__':
         logging.error(error)
         exit(1)
 
-    column_strategy_mapping = {
+    registry = StrategyRegistry({
         'First Name': NameSimilarity(),
         'Last Name': NameSimilarity(),
         'Email Address': EmailSimilarity(),
         'Zip Code': ZipCodeSimilarity(),
         'Address': AddressSimilarity()
-    }
-
-    for column, strategy in column_strategy_mapping.items():
-        SimilarityStrategyFactory.register_strategy(column, strategy)
+    })
 
     weights = {
         'First Name': 0.2,
@@ -64,13 +63,23 @@ if __name__ == '__main__':
         'Address': 0.1
     }
 
-    comparator = ContactComparator(weights)
-    finder = DuplicateFinder(comparator)
+    # Set MATCH_SCORE_PROFILE_DIR to profile the run and write cProfile and tracemalloc reports there.
+    profiler = None
+    profile_dir = os.environ.get("MATCH_SCORE_PROFILE_DIR")
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+        profiler = Profiler(cprofile_path=os.path.join(profile_dir, "run.prof"),
+                            tracemalloc_path=os.path.join(profile_dir, "tracemalloc.txt"))
+
+    comparator = ContactComparator(weights, registry)
+    finder = DuplicateFinder(comparator, profiler=profiler)
 
     try:
         results = finder.find_duplicates(contacts_df)
         save_results_to_csv(results, "output.csv")
         logging.info("Results saved to output.csv")
+        if profiler is not None:
+            logging.info(f"Pipeline profile:\n{profiler.report()}")
     except Exception as e:
         logging.error(f"An unexpected error occurred: {e}")
         exit(1)
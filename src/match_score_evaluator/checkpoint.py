@@ -0,0 +1,117 @@
+from __future__ import annotations
+import json
+import os
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    import polars as pl
+
+
+class CheckpointManifest:
+    """
+        Tracks the work units of a checkpointed run and persists their results as they complete.
+
+        Each completed unit is written to its own Parquet file in the checkpoint directory and
+        recorded in a JSON manifest. Files are written to a temporary path and atomically moved
+        into place, so a run interrupted at any point leaves only complete units behind.
+
+        A manifest is bound to a fingerprint of the run (input data and configuration); resuming
+        with a different fingerprint is refused rather than mixing results of different runs.
+
+        Attributes:
+        - directory (str): The checkpoint directory.
+        - fingerprint (dict[str, Any]): JSON-serializable description of the run.
+        - total_units (int): The number of work units in the run.
+
+        Methods:
+        - is_complete(unit): Checks whether a work unit has already been completed.
+        - save_unit(unit, results): Persists the results of a work unit and marks it as completed.
+        - load_results(schema): Concatenates the results of all work units in order.
+    """
+
+    MANIFEST_FILE = "manifest.json"
+
+    def __init__(self, directory: str, fingerprint: dict[str, Any], total_units: int):
+        self.directory = directory
+        self.fingerprint = fingerprint
+        self.total_units = total_units
+        self._completed: set[int] = set()
+
+        os.makedirs(directory, exist_ok=True)
+        manifest_path = os.path.join(directory, self.MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as manifest_file:
+                manifest = json.load(manifest_file)
+            if manifest["fingerprint"] != fingerprint or manifest["total_units"] != total_units:
+                raise ValueError(f"Checkpoint directory '{directory}' belongs to a different run. "
+                                 f"Use an empty directory or remove the existing checkpoint.")
+            self._completed = set(manifest["completed"])
+
+    def is_complete(self, unit: int) -> bool:
+        """
+        Checks whether a work unit has already been completed.
+
+        Parameters:
+        - unit (int): The number of the work unit.
+
+        Returns:
+        - bool: True if the unit's results are persisted.
+        """
+        return unit in self._completed
+
+    def save_unit(self, unit: int, results: pl.DataFrame) -> None:
+        """
+        Persists the results of a work unit and records it in the manifest.
+
+        Parameters:
+        - unit (int): The number of the work unit.
+        - results (pl.DataFrame): The results produced by the unit.
+        """
+        unit_path = self._unit_path(unit)
+        results.write_parquet(f"{unit_path}.tmp")
+        os.replace(f"{unit_path}.tmp", unit_path)
+
+        self._completed.add(unit)
+        self._write_manifest()
+
+    def load_results(self, schema: Optional[dict[str, pl.DataType]] = None) -> pl.DataFrame:
+        """
+        Concatenates the results of all work units in unit order.
+
+        Parquet does not round-trip every dtype on all supported Polars versions (an empty Enum
+        column is read back as Categorical on Polars 1.x), so the units can be cast back to the
+        schema of the run before they are combined.
+
+        Parameters:
+        - schema (dict[str, pl.DataType]): The dtype of each result column; if omitted, units are
+          combined as read.
+
+        Returns:
+        - pl.DataFrame: The combined results of the run.
+
+        Raises:
+        - ValueError: If some work units have not been completed yet.
+        """
+        import polars as pl
+
+        missing = [unit for unit in range(self.total_units) if unit not in self._completed]
+        if missing:
+            raise ValueError(f"Cannot load results: {len(missing)} of {self.total_units} work units are incomplete")
+        units = [pl.read_parquet(self._unit_path(unit)) for unit in range(self.total_units)]
+        if schema is not None:
+            units = [results.cast({column: dtype for column, dtype in schema.items()}) for results in units]
+        return pl.concat(units)
+
+    def _unit_path(self, unit: int) -> str:
+        return os.path.join(self.directory, f"unit-{unit:06d}.parquet")
+
+    def _write_manifest(self) -> None:
+        manifest_path = os.path.join(self.directory, self.MANIFEST_FILE)
+        manifest = {
+            "fingerprint": self.fingerprint,
+            "total_units": self.total_units,
+            "completed": sorted(self._completed)
+        }
+        with open(f"{manifest_path}.tmp", "w") as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        os.replace(f"{manifest_path}.tmp", manifest_path)
@@ -1,5 +1,14 @@
-from typing import Dict, Any
-from .similarity_factory import SimilarityStrategyFactory
+from __future__ import annotations
+from typing import TYPE_CHECKING, Dict, Any, Optional
+from .profiling import NullProfiler
+from .similarity_factory import SimilarityStrategyFactory, StrategyRegistry
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+    import polars as pl
+    from .profiling import Profiler
+    from .strategies import SimilarityStrategy
 
 
 class ContactComparator:
@@ -7,18 +16,41 @@ class ContactComparator:
         Calculates a similarity score between two contacts based on multiple fields.
 
         Each field's similarity is determined by a specific strategy, and the total score
-        is a weighted sum of the field scores.
+        is a weighted sum of the field scores. The strategy of every weighted field is resolved
+        once at construction, so scoring involves no registry lookups or global state.
 
         Attributes:
         - weights (dict[str, float]): A dictionary where keys are field names, and values are
           their respective weights in the total score calculation.
+        - registry (StrategyRegistry): The strategies used to compare each field. Defaults to a
+          snapshot of the strategies registered with `SimilarityStrategyFactory`.
+        - costs (dict[str, float]): The estimated cost of scoring one pair on each weighted field, used to
+          order the fields of a cascade. Defaults to the relative `cost` of each field's strategy.
 
         Methods:
         - calculate_score(contact1, contact2): Computes the weighted similarity score for a pair of contacts.
+        - calculate_field_similarities(contact1, contact2): Computes the unweighted similarity of each field.
+        - calculate_field_scores(left, right, profiler): Computes per-field similarity arrays for aligned batches of contacts.
+        - combine_scores(field_scores): Computes the weighted total score from per-field similarity arrays.
+        - calculate_scores_cascade(left, right, threshold, profiler): Scores aligned batches field by field,
+          dropping pairs that can no longer reach the threshold.
+        - calibrate_costs(left, right, sample_size): Measures the cost of each field on a sample of pairs.
     """
 
-    def __init__(self, weights: dict[str, float]):
-        self.weights = weights
+    def __init__(self, weights: dict[str, float], registry: Optional[StrategyRegistry] = None,
+                 costs: Optional[dict[str, float]] = None):
+        self.weights = dict(weights)
+        self.registry = registry if registry is not None else SimilarityStrategyFactory.build_registry()
+        self._fields = tuple(
+            (field, weight, self.registry.get_strategy(field)) for field, weight in self.weights.items()
+        )
+        self.costs = {field: strategy.cost for field, _, strategy in self._fields}
+        for field, cost in (costs or {}).items():
+            if field not in self.costs:
+                raise ValueError(f"Cannot set the cost of unweighted field: {field}")
+            if cost < 0:
+                raise ValueError(f"Field costs must not be negative, got {cost} for {field}")
+            self.costs[field] = cost
 
     def calculate_score(self, contact1: Dict[str, Any], contact2: Dict[str, Any]) -> float:
         """
@@ -26,7 +58,7 @@ class ContactComparator:
 
             Steps:
             1. For each field in the weights dictionary:
-               a. Retrieve the corresponding similarity strategy using the field name.
+               a. Take the similarity strategy resolved for the field at construction.
                b. Calculate the similarity score between the two contact values for that field.
                c. Multiply the similarity score by the field's weight and add it to the total score.
             2. Return the cumulative similarity score for the two contacts.
@@ -39,8 +71,201 @@ class ContactComparator:
             - float: The weighted similarity score between the two contacts.
         """
         score: float = 0.0
-        for field, weight in self.weights.items():
-            strategy = SimilarityStrategyFactory.get_strategy(field)
-            similarity = strategy.calculate(contact1[field], contact2[field])
-            score += weight * similarity
+        for field, weight, strategy in self._fields:
+            score += weight * strategy.calculate(contact1[field], contact2[field])
         return score
+
+    def calculate_field_similarities(self, contact1: Dict[str, Any], contact2: Dict[str, Any]) -> dict[str, float]:
+        """
+            Calculates the unweighted similarity of every weighted field for a pair of contacts.
+
+            Parameters:
+            - contact1 (dict): A dictionary containing the first contact's field values.
+            - contact2 (dict): A dictionary containing the second contact's field values.
+
+            Returns:
+            - dict[str, float]: The similarity of each field, in the order of the weights dictionary.
+        """
+        return {field: strategy.calculate(contact1[field], contact2[field]) for field, _, strategy in self._fields}
+
+    def calculate_field_scores(self, left: pl.DataFrame, right: pl.DataFrame,
+                               profiler: Optional[Profiler] = None) -> dict[str, npt.NDArray[np.float64]]:
+        """
+            Calculates per-field similarities for aligned batches of contacts in a single pass.
+
+            Row `i` of `left` is compared with row `i` of `right`. Each strategy scores a whole
+            column at once, so the per-row Python overhead of `calculate_score` is avoided.
+
+            Parameters:
+            - left (pl.DataFrame): The first contact of each pair.
+            - right (pl.DataFrame): The second contact of each pair, aligned with `left`.
+            - profiler (Profiler): Optionally records each strategy as a 'strategy: <field> (<strategy>)' stage.
+
+            Returns:
+            - dict[str, np.ndarray]: A float64 similarity array per field, in the order of the weights dictionary.
+        """
+        if left.height != right.height:
+            raise ValueError(f"Cannot compare batches of different lengths: {left.height} and {right.height}")
+
+        if profiler is None:
+            return {field: strategy.calculate_batch(left[field], right[field]) for field, _, strategy in self._fields}
+
+        field_scores: dict[str, npt.NDArray[np.float64]] = {}
+        for field, _, strategy in self._fields:
+            with profiler.stage(f"strategy: {field} ({type(strategy).__name__})"):
+                field_scores[field] = strategy.calculate_batch(left[field], right[field])
+        return field_scores
+
+    def combine_scores(self, field_scores: dict[str, npt.NDArray[np.float64]]) -> npt.NDArray[np.float64]:
+        """
+            Combines per-field similarity arrays into weighted total scores.
+
+            Fields are accumulated in the same order as `calculate_score`, so batch and
+            single-pair scores are identical.
+
+            Parameters:
+            - field_scores (dict[str, np.ndarray]): Per-field similarities as returned by `calculate_field_scores`.
+
+            Returns:
+            - np.ndarray: The weighted similarity score of each pair.
+        """
+        import numpy as np
+
+        length = len(next(iter(field_scores.values()))) if field_scores else 0
+        scores = np.zeros(length, dtype=np.float64)
+        for field, weight, _ in self._fields:
+            scores += weight * field_scores[field]
+        return scores
+
+    def calculate_scores_cascade(self, left: pl.DataFrame, right: pl.DataFrame, threshold: float,
+                                 profiler: Optional[Profiler] = None) -> CascadeResult:
+        """
+            Calculates the scores of aligned batches of contacts, keeping only pairs that reach a threshold.
+
+            Fields are evaluated one at a time across the whole batch, cheapest per unit of weight
+            first. Since every similarity lies between 0 and 1, a pair can gain at most the weights
+            of the fields not evaluated yet; pairs whose partial score plus those weights falls
+            short of the threshold are dropped, so the expensive fields only score the survivors.
+
+            The scores of the surviving pairs are identical to those of `combine_scores`, and no
+            pair scoring at least the threshold is ever dropped.
+
+            Parameters:
+            - left (pl.DataFrame): The first contact of each pair.
+            - right (pl.DataFrame): The second contact of each pair, aligned with `left`.
+            - threshold (float): The minimum score of the pairs to keep.
+            - profiler (Profiler): Optionally records each strategy as a 'strategy: <field> (<strategy>)' stage.
+
+            Returns:
+            - CascadeResult: The surviving pairs, their field similarities and scores, and per-stage statistics.
+
+            Raises:
+            - ValueError: If the batches differ in length or a weight is negative.
+        """
+        import numpy as np
+
+        if left.height != right.height:
+            raise ValueError(f"Cannot compare batches of different lengths: {left.height} and {right.height}")
+        profiler = profiler or NullProfiler()
+        if any(weight < 0 for weight in self.weights.values()):
+            raise ValueError("Cascade scoring requires non-negative weights")
+
+        indices = np.arange(left.height)
+        partial_scores = np.zeros(left.height, dtype=np.float64)
+        remaining_weight = sum(self.weights.values())
+        field_scores: dict[str, npt.NDArray[np.float64]] = {}
+        stages: list[dict[str, Any]] = []
+        for field, weight, strategy in self._cascade_order():
+            if len(indices) < left.height:
+                left_values, right_values = left[field].gather(indices), right[field].gather(indices)
+            else:
+                left_values, right_values = left[field], right[field]
+            with profiler.stage(f"strategy: {field} ({type(strategy).__name__})"):
+                similarities = strategy.calculate_batch(left_values, right_values)
+
+            # The tolerance absorbs rounding differences between this order of summation and that of
+            # combine_scores, so a pair scoring exactly the threshold is never dropped.
+            remaining_weight -= weight
+            partial_scores += weight * similarities
+            field_scores[field] = similarities
+            reachable = partial_scores + remaining_weight >= threshold - 1e-9
+            stages.append({
+                "Field": field,
+                "Strategy": type(strategy).__name__,
+                "Cost": self.costs[field],
+                "Evaluated": len(indices),
+                "Eliminated": int(len(indices) - np.count_nonzero(reachable))
+            })
+            if not reachable.all():
+                indices, partial_scores = indices[reachable], partial_scores[reachable]
+                field_scores = {name: values[reachable] for name, values in field_scores.items()}
+
+        field_scores = {field: field_scores[field] for field, _, _ in self._fields}
+        scores = self.combine_scores(field_scores) if field_scores else np.zeros(len(indices), dtype=np.float64)
+        reached = scores >= threshold
+        if not reached.all():
+            if stages:
+                stages[-1]["Eliminated"] += int(len(indices) - np.count_nonzero(reached))
+            indices, scores = indices[reached], scores[reached]
+            field_scores = {name: values[reached] for name, values in field_scores.items()}
+        return CascadeResult(indices, field_scores, scores, stages)
+
+    def calibrate_costs(self, left: pl.DataFrame, right: pl.DataFrame, sample_size: int = 1000) -> dict[str, float]:
+        """
+            Measures the cost of scoring each weighted field and uses it to order future cascades.
+
+            Each strategy scores the first `sample_size` pairs of the batches after a short warm-up,
+            and its cost is set to the measured time per pair in seconds.
+
+            Parameters:
+            - left (pl.DataFrame): The first contact of each pair.
+            - right (pl.DataFrame): The second contact of each pair, aligned with `left`.
+            - sample_size (int): The maximum number of pairs to time (default is 1000).
+
+            Returns:
+            - dict[str, float]: The measured cost of each field.
+
+            Raises:
+            - ValueError: If the batches differ in length or no pair is sampled.
+        """
+        import time
+
+        if left.height != right.height:
+            raise ValueError(f"Cannot compare batches of different lengths: {left.height} and {right.height}")
+        sample_left, sample_right = left.head(sample_size), right.head(sample_size)
+        if sample_left.height == 0:
+            raise ValueError("Cannot calibrate costs without any pairs")
+
+        for field, _, strategy in self._fields:
+            strategy.calculate_batch(sample_left[field].head(10), sample_right[field].head(10))
+            start = time.perf_counter()
+            strategy.calculate_batch(sample_left[field], sample_right[field])
+            self.costs[field] = (time.perf_counter() - start) / sample_left.height
+        return dict(self.costs)
+
+    def _cascade_order(self) -> list[tuple[str, float, SimilarityStrategy]]:
+        """
+            Orders the weighted fields by cost per unit of weight, fields without weight last.
+        """
+        return sorted(self._fields, key=lambda item: self.costs[item[0]] / item[1] if item[1] else float("inf"))
+
+
+class CascadeResult:
+    """
+        The pairs of a batch that survived a scoring cascade.
+
+        Attributes:
+        - indices (np.ndarray): The positions of the surviving pairs in the scored batch, in ascending order.
+        - field_scores (dict[str, np.ndarray]): The similarity of each field for the surviving pairs,
+          in the order of the weights dictionary.
+        - scores (np.ndarray): The weighted similarity score of each surviving pair.
+        - stages (list[dict[str, Any]]): One entry per evaluated field, in cascade order, with its
+          'Field', 'Strategy', 'Cost', and the number of pairs it 'Evaluated' and 'Eliminated'.
+    """
+
+    def __init__(self, indices: npt.NDArray[np.int64], field_scores: dict[str, npt.NDArray[np.float64]],
+                 scores: npt.NDArray[np.float64], stages: list[dict[str, Any]]):
+        self.indices = indices
+        self.field_scores = field_scores
+        self.scores = scores
+        self.stages = stages
@@ -1,10 +1,18 @@
-import polars as pl
+from __future__ import annotations
+import os
 import logging
+from typing import TYPE_CHECKING, Any, Optional, Sequence
+from .checkpoint import CheckpointManifest
 from .contact_comparator import ContactComparator
+from .feature_store import FeatureStore
+from .profiling import NullProfiler, Profiler
+from .sharding import MultiprocessingQueue, WorkQueue, run_sharded
 from .similarity_categorizer import SimilarityCategorizer
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+if TYPE_CHECKING:
+    import polars as pl
+
+logger = logging.getLogger(__name__)
 
 
 class DuplicateFinder:
@@ -12,29 +20,62 @@ class DuplicateFinder:
         Identifies potential duplicate contacts in a dataset by comparing all unique pairs.
 
         This class uses a comparator to calculate similarity scores and a categorizer
-        to classify the similarity accuracy for each pair.
+        to classify the similarity accuracy for each pair. When block columns are configured,
+        only contacts sharing the same values in all of them (a block) are compared.
 
         Attributes:
         - comparator (ContactComparator): Used to compute similarity scores between contacts.
+        - categorizer (SimilarityCategorizer): Used to classify similarity scores into accuracy levels.
+        - include_field_scores (bool): Whether to add a Float32 similarity column per field to the results.
+        - block_by (list[str]): Columns whose values must match for two contacts to be compared. Contacts
+          with a null block value are not compared. Empty by default, comparing all pairs.
+        - profiler (Profiler): Records the time and net memory change of each pipeline stage and strategy. Profiling
+          is disabled by default. Sharded runs only profile the coordinating process.
+        - min_score (float | None): When set, only pairs scoring at least this much are reported, and pairs
+          that can no longer reach it are dropped before their expensive fields are scored.
+        - cascade_stats (list[dict[str, Any]]): When `min_score` is set, the number of pairs each field of the
+          cascade evaluated and eliminated during the last run, in cascade order. Not collected by sharded runs.
 
         Methods:
         - find_duplicates(contacts): Finds potential duplicates and returns a DataFrame with match details.
+        - find_duplicates_resumable(contacts, checkpoint_dir, unit_size): Same as find_duplicates, checkpointed per unit.
+        - find_duplicates_sharded(contacts, num_shards, queue, num_workers): Same as find_duplicates, split by block
+          into shards processed by worker processes.
+        - link(left, right, left_mapping, right_mapping, unit_size): Finds matches between two datasets.
+        - explain(contact_id_a, contact_id_b): Breaks down the score of one pair from the last run.
     """
 
-    def __init__(self, comparator: ContactComparator):
+    def __init__(self, comparator: ContactComparator, include_field_scores: bool = False,
+                 categorizer: Optional[SimilarityCategorizer] = None, block_by: Optional[Sequence[str]] = None,
+                 profiler: Optional[Profiler] = None, min_score: Optional[float] = None):
         self.comparator = comparator
+        self.categorizer = categorizer or SimilarityCategorizer()
+        self.include_field_scores = include_field_scores
+        self.block_by = list(block_by or [])
+        self.profiler = profiler or NullProfiler()
+        self.min_score = min_score
+        self.cascade_stats: list[dict[str, Any]] = []
+        self._feature_stores: Optional[tuple[FeatureStore, FeatureStore]] = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The cached contacts are only needed for explain, and profiling stays in the coordinating
+        # process; don't ship either to worker processes.
+        return {**self.__dict__, "_feature_stores": None, "profiler": NullProfiler()}
 
     def find_duplicates(self, contacts: pl.DataFrame) -> pl.DataFrame:
         """
         Identifies potential duplicate contacts from the given DataFrame.
 
         Steps:
-        1. Creates all possible unique pairs of contacts by performing a cross join.
+        1. Creates all possible unique pairs of contacts by performing a cross join on the contact IDs,
+           or a join on the block columns when `block_by` is set.
         2. Filters out pairs where the left contact ID is not less than the right contact ID to avoid duplicate comparisons.
-        3. Calculates similarity scores for each pair of contacts using the provided comparator.
-        4. Categorizes the similarity score into High, Medium, or Low accuracy.
+        3. Calculates per-field similarity scores for all pairs at once using the provided comparator.
+        4. Categorizes the weighted similarity scores into accuracy levels using the categorizer.
         5. Collects all pairs and their corresponding accuracy levels into a new DataFrame.
 
+        The contacts are cached so that individual pairs can later be broken down with `explain`.
+
         Parameters:
         - contacts (pl.DataFrame): A DataFrame containing contact information. Each contact must have a unique 'Contact ID'.
 
@@ -43,26 +84,332 @@ class DuplicateFinder:
           * 'ContactID Source' - The ID of the first contact in the pair.
           * 'ContactID Match' - The ID of the second contact in the pair.
           * 'Accuracy' - The categorized similarity score for the contact pair.
+          * '<field> Score' - The Float32 similarity of each weighted field, only when `include_field_scores` is set.
+          Only pairs scoring at least `min_score` are included when it is set.
+        """
+        self._cache_contacts(contacts, contacts)
+        self.cascade_stats = []
+
+        with self.profiler.session():
+            with self.profiler.stage("pairing"):
+                contact_ids = self._contact_ids(contacts)
+                contact_pairs = self._unique_pairs(contact_ids, contact_ids)
+            return self._score_pairs(contacts, contacts, contact_pairs)
+
+    def find_duplicates_resumable(self, contacts: pl.DataFrame, checkpoint_dir: str,
+                                  unit_size: int = 1000) -> pl.DataFrame:
+        """
+        Identifies potential duplicate contacts, persisting progress so an interrupted run can resume.
+
+        The pair space is split into numbered work units, each covering `unit_size` consecutive
+        contacts paired with every contact that follows them in ID order. Each unit's results are
+        written to `checkpoint_dir` as soon as it completes. Calling this method again with the same
+        contacts, configuration and directory skips the completed units and resumes with the rest.
+
+        The combined results are identical, row for row, to those of `find_duplicates`.
+
+        Parameters:
+        - contacts (pl.DataFrame): A DataFrame containing contact information. Each contact must have a unique 'Contact ID'.
+        - checkpoint_dir (str): Directory holding the manifest and the results of completed units.
+        - unit_size (int): The number of source contacts per work unit (default is 1000).
+
+        Returns:
+        - pl.DataFrame: The same columns as `find_duplicates`.
+
+        Raises:
+        - ValueError: If `unit_size` is not positive or `checkpoint_dir` holds a checkpoint of a different run.
+        """
+        if unit_size <= 0:
+            raise ValueError(f"unit_size must be positive, got {unit_size}")
+
+        self._cache_contacts(contacts, contacts)
+        self.cascade_stats = []
+
+        total_units = max(1, -(-contacts.height // unit_size))
+        manifest = CheckpointManifest(checkpoint_dir, self._fingerprint(contacts, unit_size), total_units)
+
+        with self.profiler.session():
+            contact_ids = self._contact_ids(contacts)
+            for unit in range(total_units):
+                if manifest.is_complete(unit):
+                    logger.info(f"Skipping completed work unit {unit + 1}/{total_units}")
+                    continue
+                with self.profiler.stage("pairing"):
+                    contact_pairs = self._unique_pairs(contact_ids.slice(unit * unit_size, unit_size), contact_ids)
+                results = self._score_pairs(contacts, contacts, contact_pairs)
+                with self.profiler.stage("checkpoint"):
+                    manifest.save_unit(unit, results)
+                logger.info(f"Completed work unit {unit + 1}/{total_units}")
+
+            with self.profiler.stage("checkpoint"):
+                return manifest.load_results(self._result_schema(contacts, contacts))
+
+    def find_duplicates_sharded(self, contacts: pl.DataFrame, num_shards: int,
+                                queue: Optional[WorkQueue] = None, num_workers: Optional[int] = None) -> pl.DataFrame:
+        """
+        Identifies potential duplicate contacts by splitting the work by block into shards processed by workers.
+
+        Every block is assigned to exactly one shard, so the shards can be processed independently
+        and their results merged. Shards are dispatched through a work queue: by default a
+        `MultiprocessingQueue` served by local worker processes. With a `SpoolQueue`, workers on
+        other machines sharing the spool directory can join the run.
+
+        The results contain the same rows as `find_duplicates`, grouped by shard.
+
+        Parameters:
+        - contacts (pl.DataFrame): A DataFrame containing contact information. Each contact must have a unique 'Contact ID'.
+        - num_shards (int): The maximum number of shards to split the contacts into.
+        - queue (WorkQueue): The queue used to dispatch shards (default is a new `MultiprocessingQueue`).
+        - num_workers (int): The number of local worker processes (default is the number of CPUs).
+          With 0, shards are processed in the current process.
+
+        Returns:
+        - pl.DataFrame: The same columns as `find_duplicates`.
+
+        Raises:
+        - ValueError: If no block columns are configured or `num_shards` is not positive.
+        - RuntimeError: If a worker fails to process a shard.
+        """
+        if not self.block_by:
+            raise ValueError("Sharded execution requires block_by to be set")
+        if num_shards <= 0:
+            raise ValueError(f"num_shards must be positive, got {num_shards}")
+
+        self.cascade_stats = []
+        with self.profiler.session(), self.profiler.stage("sharding"):
+            results = run_sharded(self, contacts, num_shards, queue or MultiprocessingQueue(),
+                                  os.cpu_count() or 1 if num_workers is None else num_workers)
+        self._cache_contacts(contacts, contacts)
+        return results
+
+    def link(self, left: pl.DataFrame, right: pl.DataFrame, left_mapping: Optional[dict[str, str]] = None,
+             right_mapping: Optional[dict[str, str]] = None, unit_size: int = 1000) -> pl.DataFrame:
+        """
+        Finds matches between two datasets, comparing every left contact with the right contacts only.
+
+        Unlike `find_duplicates`, no contact is compared with another contact of its own dataset, so
+        matching a small import against a large master dataset costs left x right comparisons rather
+        than those of the combined datasets. The datasets may come from differently shaped sources:
+        each is aligned to the standard column names with its own mapping, as in `load_contacts_from_csv`.
+        When `block_by` is set, only contacts in the same block are compared.
+
+        Pairs are generated and scored for `unit_size` left contacts at a time, which bounds memory use.
+
+        Parameters:
+        - left (pl.DataFrame): The contacts to match, e.g. an import.
+        - right (pl.DataFrame): The contacts to match against, e.g. the master dataset.
+        - left_mapping (dict[str, str]): Mapping of the left column names to standard column names.
+        - right_mapping (dict[str, str]): Mapping of the right column names to standard column names.
+        - unit_size (int): The number of left contacts scored at a time (default is 1000).
+
+        Returns:
+        - pl.DataFrame: The same columns as `find_duplicates`, with the left contact ID as 'ContactID Source'
+          and the right contact ID as 'ContactID Match'.
+
+        Raises:
+        - ValueError: If `unit_size` is not positive or a dataset lacks a required column.
+        """
+        import polars as pl
+
+        if unit_size <= 0:
+            raise ValueError(f"unit_size must be positive, got {unit_size}")
+
+        with self.profiler.session():
+            with self.profiler.stage("align"):
+                left, right = self._align(left, left_mapping), self._align(right, right_mapping)
+                mismatched = [column for column in left.columns[1:] if left.schema[column] != right.schema[column]]
+                left = left.with_columns(pl.col(mismatched).cast(pl.String))
+                right = right.with_columns(pl.col(mismatched).cast(pl.String))
+            self._cache_contacts(left, right)
+            self.cascade_stats = []
+
+            left_ids, right_ids = self._contact_ids(left), self._contact_ids(right)
+            results = []
+            for start in range(0, max(left.height, 1), unit_size):
+                with self.profiler.stage("pairing"):
+                    contact_pairs = self._candidate_pairs(left_ids.slice(start, unit_size), right_ids)
+                results.append(self._score_pairs(left, right, contact_pairs))
+            return pl.concat(results)
+
+    def explain(self, contact_id_a: Any, contact_id_b: Any) -> dict[str, Any]:
+        """
+        Recomputes the score of a single pair of contacts from the last run.
+
+        Only the two contacts involved are scored, using the contacts cached by the last run,
+        so a questioned match can be audited without rerunning the job.
+
+        Parameters:
+        - contact_id_a (Any): The ID of the first contact (of the left dataset after `link`).
+        - contact_id_b (Any): The ID of the second contact (of the right dataset after `link`).
+
+        Returns:
+        - dict[str, Any]: A dictionary containing:
+          * 'ContactID Source' and 'ContactID Match' - The IDs of the explained pair.
+          * 'Score' - The weighted similarity score.
+          * 'Accuracy' - The categorized similarity score.
+          * 'Field Scores' - The unweighted similarity of each field.
+          * 'Contributions' - The weighted contribution of each field to the score.
+
+        Raises:
+        - ValueError: If no run has been made yet or either contact ID is unknown.
+        """
+        if self._feature_stores is None:
+            raise ValueError("No contacts cached. Run find_duplicates or link before explaining a match.")
+
+        contact1 = self._feature_stores[0].get(contact_id_a)
+        contact2 = self._feature_stores[1].get(contact_id_b)
+        field_scores = self.comparator.calculate_field_similarities(contact1, contact2)
+        contributions = {field: self.comparator.weights[field] * similarity
+                         for field, similarity in field_scores.items()}
+        score: float = 0.0
+        for contribution in contributions.values():
+            score += contribution
+
+        return {
+            'ContactID Source': contact_id_a,
+            'ContactID Match': contact_id_b,
+            'Score': score,
+            'Accuracy': self.categorizer.categorize(score),
+            'Field Scores': field_scores,
+            'Contributions': contributions
+        }
+
+    def _cache_contacts(self, left: pl.DataFrame, right: pl.DataFrame) -> None:
+        """
+        Caches the contacts of a run for explain.
+        """
+        left_store = FeatureStore(left)
+        self._feature_stores = (left_store, left_store if right is left else FeatureStore(right))
+
+    def _align(self, contacts: pl.DataFrame, column_mapping: Optional[dict[str, str]]) -> pl.DataFrame:
+        """
+        Renames the columns of a dataset to the standard names and keeps only the columns used for matching.
+        """
+        if column_mapping:
+            contacts = contacts.rename(column_mapping)
+        columns = list(dict.fromkeys(["Contact ID", *self.comparator.weights, *self.block_by]))
+        missing = [column for column in columns if column not in contacts.columns]
+        if missing:
+            raise ValueError(f"Missing required columns: {', '.join(missing)}")
+        return contacts.select(columns)
+
+    def _contact_ids(self, contacts: pl.DataFrame) -> pl.DataFrame:
         """
-        results = []
-        contact_pairs = contacts.rename({col: f"{col}_left" for col in contacts.columns}).join(
-            contacts.rename({col: f"{col}_right" for col in contacts.columns}), how="cross"
-        ).filter(pl.col("Contact ID_left") < pl.col("Contact ID_right"))
+        Selects the contact IDs and block columns, numbering the contacts by row.
+        """
+        return contacts.select(["Contact ID", *self.block_by]).with_row_index("row")
+
+    def _unique_pairs(self, source_ids: pl.DataFrame, contact_ids: pl.DataFrame) -> pl.DataFrame:
+        """
+        Pairs every source contact with every contact of a higher ID in the same block, keeping their row numbers.
+        """
+        import polars as pl
+
+        return self._candidate_pairs(source_ids, contact_ids, pl.col("Contact ID") < pl.col("Contact ID_right"))
+
+    def _candidate_pairs(self, source_ids: pl.DataFrame, target_ids: pl.DataFrame,
+                         predicate: Optional[pl.Expr] = None) -> pl.DataFrame:
+        """
+        Pairs every source contact with every target contact in the same block that satisfies the predicate,
+        ordered by source row and then target row.
+        """
+        if not self.block_by:
+            pairs = source_ids.join(target_ids, how="cross", suffix="_right")
+            return pairs if predicate is None else pairs.filter(predicate)
+        pairs = source_ids.join(target_ids, on=self.block_by, how="inner", suffix="_right")
+        return (pairs if predicate is None else pairs.filter(predicate)).sort(["row", "row_right"])
+
+    def _score_pairs(self, left_contacts: pl.DataFrame, right_contacts: pl.DataFrame,
+                     contact_pairs: pl.DataFrame) -> pl.DataFrame:
+        """
+        Scores and categorizes the given pairs of contacts and builds the result DataFrame.
+        """
+        import polars as pl
 
-        for row in contact_pairs.rows(named=True):
-            contact1 = {key.replace('_left', ''): value for key, value in row.items() if '_left' in key}
-            contact2 = {key.replace('_right', ''): value for key, value in row.items() if '_right' in key}
+        profiler = self.profiler
+        with profiler.stage("gather"):
+            left = left_contacts.select(pl.all().gather(contact_pairs["row"]))
+            right = right_contacts.select(pl.all().gather(contact_pairs["row_right"]))
 
-            score = self.comparator.calculate_score(contact1, contact2)
-            accuracy = SimilarityCategorizer.categorize(score)
+        strategy_profiler = None if isinstance(profiler, NullProfiler) else profiler
+        if self.min_score is None:
+            with profiler.stage("scoring"):
+                field_scores = self.comparator.calculate_field_scores(left, right, strategy_profiler)
+            with profiler.stage("combine"):
+                scores = self.comparator.combine_scores(field_scores)
+        else:
+            with profiler.stage("scoring"):
+                cascade = self.comparator.calculate_scores_cascade(left, right, self.min_score, strategy_profiler)
+            field_scores, scores = cascade.field_scores, cascade.scores
+            contact_pairs = contact_pairs.select(pl.all().gather(cascade.indices))
+            self._record_cascade_stages(cascade.stages)
+        with profiler.stage("categorize"):
+            accuracies = self.categorizer.categorize_array(scores)
 
-            logging.info(
-                f"Score between {contact1['Contact ID']} and {contact2['Contact ID']}: {score}, Accuracy: {accuracy}")
+        source_ids = contact_pairs["Contact ID"]
+        match_ids = contact_pairs["Contact ID_right"]
+        if logger.isEnabledFor(logging.INFO):
+            with profiler.stage("logging"):
+                for source_id, match_id, score, accuracy in zip(source_ids.to_list(), match_ids.to_list(),
+                                                                scores.tolist(), accuracies.to_list()):
+                    logger.info(f"Score between {source_id} and {match_id}: {score}, Accuracy: {accuracy}")
 
-            results.append({
-                'ContactID Source': contact1['Contact ID'],
-                'ContactID Match': contact2['Contact ID'],
-                'Accuracy': accuracy
-            })
+        with profiler.stage("results"):
+            results = [
+                source_ids.alias('ContactID Source'),
+                match_ids.alias('ContactID Match'),
+                accuracies
+            ]
+            if self.include_field_scores:
+                results.extend(
+                    pl.Series(f"{field} Score", similarities, dtype=pl.Float32)
+                    for field, similarities in field_scores.items()
+                )
+            return pl.DataFrame(results)
+
+    def _record_cascade_stages(self, stages: list[dict[str, Any]]) -> None:
+        """
+        Adds the pair counts of a cascade to those of the previous batches of the run.
+        """
+        if not self.cascade_stats:
+            self.cascade_stats = [dict(stage) for stage in stages]
+            return
+        for totals, stage in zip(self.cascade_stats, stages):
+            totals["Evaluated"] += stage["Evaluated"]
+            totals["Eliminated"] += stage["Eliminated"]
+
+    def _result_schema(self, left_contacts: pl.DataFrame, right_contacts: pl.DataFrame) -> dict[str, pl.DataType]:
+        """
+        Describes the dtype of each result column for the given contacts.
+        """
+        import polars as pl
+
+        schema: dict[str, pl.DataType] = {
+            'ContactID Source': left_contacts.schema["Contact ID"],
+            'ContactID Match': right_contacts.schema["Contact ID"],
+            'Accuracy': pl.Enum(self.categorizer.labels)
+        }
+        if self.include_field_scores:
+            schema.update({f"{field} Score": pl.Float32() for field in self.comparator.weights})
+        return schema
+
+    def _fingerprint(self, contacts: pl.DataFrame, unit_size: int) -> dict[str, Any]:
+        """
+        Describes the input and configuration of a checkpointed run.
+        """
+        import hashlib
 
-        return pl.DataFrame(results)
+        return {
+            "contacts": hashlib.sha256(contacts.hash_rows(seed=0).to_numpy().tobytes()).hexdigest(),
+            "rows": contacts.height,
+            "columns": contacts.columns,
+            "unit_size": unit_size,
+            "weights": self.comparator.weights,
+            "strategies": {field: type(self.comparator.registry.get_strategy(field)).__name__
+                           for field in self.comparator.weights},
+            "thresholds": list(self.categorizer.thresholds),
+            "labels": list(self.categorizer.labels),
+            "include_field_scores": self.include_field_scores,
+            "block_by": self.block_by,
+            "min_score": self.min_score
+        }
@@ -0,0 +1,45 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    import polars as pl
+
+
+class FeatureStore:
+    """
+        Caches a contacts DataFrame for fast lookups of individual contacts by ID.
+
+        The ID index is built lazily on the first lookup, so caching the contacts of a run
+        costs nothing unless a lookup is actually made.
+
+        Attributes:
+        - contacts (pl.DataFrame): The cached contacts.
+        - id_column (str): The name of the column holding the unique contact ID.
+
+        Methods:
+        - get(contact_id): Returns the cached contact with the given ID as a dictionary.
+    """
+
+    def __init__(self, contacts: pl.DataFrame, id_column: str = "Contact ID"):
+        self.contacts = contacts
+        self.id_column = id_column
+        self._index: Optional[dict[Any, int]] = None
+
+    def get(self, contact_id: Any) -> dict[str, Any]:
+        """
+        Retrieves a cached contact by its ID.
+
+        Parameters:
+        - contact_id (Any): The ID of the contact.
+
+        Returns:
+        - dict[str, Any]: The contact's field values keyed by column name.
+
+        Raises:
+        - ValueError: If no contact with the given ID is cached.
+        """
+        if self._index is None:
+            self._index = {value: row for row, value in enumerate(self.contacts[self.id_column].to_list())}
+        if contact_id not in self._index:
+            raise ValueError(f"No contact found with ID: {contact_id}")
+        return self.contacts.row(self._index[contact_id], named=True)
@@ -0,0 +1,175 @@
+from __future__ import annotations
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Iterator, Optional
+
+_NO_OP = nullcontext()
+
+
+class StageStats:
+    """
+        Accumulated measurements of one profiled stage.
+
+        Attributes:
+        - calls (int): The number of times the stage ran.
+        - wall_time (float): Total elapsed time in seconds.
+        - cpu_time (float): Total CPU time of the process in seconds, across all threads.
+        - net_blocks (int): Change in the number of memory blocks held by the interpreter. This is not an
+          allocation count: a stage that allocates heavily and frees it all again reports zero or less.
+        - net_memory (int | None): Change in the bytes traced by tracemalloc; None when not tracing.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.net_blocks = 0
+        self.net_memory: Optional[int] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "wall_time": self.wall_time,
+            "cpu_time": self.cpu_time,
+            "net_blocks": self.net_blocks,
+            "net_memory": self.net_memory
+        }
+
+
+class Profiler:
+    """
+        Records wall time, CPU time and net memory change per pipeline stage, and optionally whole-run profiles.
+
+        Stages are measured with the `stage` context manager and may be nested, in which case the
+        inner stages are also included in the outer one. A run wrapped in `session` can additionally
+        be profiled with cProfile and tracemalloc, whose reports are written when the session ends.
+
+        Attributes:
+        - stats (dict[str, StageStats]): The measurements of each stage, in order of first use.
+        - cprofile_path (str | None): Where to write cProfile statistics (loadable with `pstats`).
+        - tracemalloc_path (str | None): Where to write the top allocation sites traced by tracemalloc.
+        - tracemalloc_top (int): The number of allocation sites written to the tracemalloc report.
+
+        Methods:
+        - stage(name): Measures a block of code as the named stage.
+        - session(): Wraps a run in cProfile and tracemalloc, as configured.
+        - report(): Formats the stage measurements as a table.
+        - reset(): Discards all measurements.
+    """
+
+    def __init__(self, cprofile_path: Optional[str] = None, tracemalloc_path: Optional[str] = None,
+                 tracemalloc_top: int = 25):
+        self.stats: dict[str, StageStats] = {}
+        self.cprofile_path = cprofile_path
+        self.tracemalloc_path = tracemalloc_path
+        self.tracemalloc_top = tracemalloc_top
+        self._sessions = 0
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Measures the enclosed block of code as one call of the named stage.
+
+        Parameters:
+        - name (str): The name of the stage.
+        """
+        import tracemalloc
+
+        tracing = tracemalloc.is_tracing()
+        memory = tracemalloc.get_traced_memory()[0] if tracing else 0
+        blocks = sys.getallocatedblocks()
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - wall_start
+            cpu_time = time.process_time() - cpu_start
+            stats = self.stats.setdefault(name, StageStats())
+            stats.calls += 1
+            stats.wall_time += wall_time
+            stats.cpu_time += cpu_time
+            stats.net_blocks += sys.getallocatedblocks() - blocks
+            if tracing and tracemalloc.is_tracing():
+                stats.net_memory = (stats.net_memory or 0) + tracemalloc.get_traced_memory()[0] - memory
+
+    @contextmanager
+    def session(self) -> Iterator[None]:
+        """
+        Wraps a run in cProfile and tracemalloc, as configured, and writes their reports at the end.
+
+        Nested sessions are part of the outermost one, so a run calling other runs is profiled once.
+        """
+        if self._sessions or not (self.cprofile_path or self.tracemalloc_path):
+            self._sessions += 1
+            try:
+                yield
+            finally:
+                self._sessions -= 1
+            return
+
+        import cProfile
+        import tracemalloc
+
+        cprofile_path = self.cprofile_path
+        profile = cProfile.Profile() if cprofile_path else None
+        started_tracing = bool(self.tracemalloc_path) and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+
+        self._sessions += 1
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None and cprofile_path:
+                profile.disable()
+                profile.dump_stats(cprofile_path)
+            if self.tracemalloc_path:
+                self._write_tracemalloc_report(tracemalloc.take_snapshot())
+            if started_tracing:
+                tracemalloc.stop()
+            self._sessions -= 1
+
+    def report(self) -> str:
+        """
+        Formats the stage measurements as a table, slowest stages first.
+
+        Returns:
+        - str: The formatted table.
+        """
+        header = f"{'Stage':<48} {'Calls':>8} {'Wall (s)':>10} {'CPU (s)':>10} {'Net blocks':>12} {'Net memory (B)':>14}"
+        lines = [header, "-" * len(header)]
+        for name, stats in sorted(self.stats.items(), key=lambda item: item[1].wall_time, reverse=True):
+            memory = "-" if stats.net_memory is None else str(stats.net_memory)
+            lines.append(f"{name:<48} {stats.calls:>8} {stats.wall_time:>10.4f} {stats.cpu_time:>10.4f} "
+                         f"{stats.net_blocks:>12} {memory:>14}")
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        """
+        Discards all stage measurements.
+        """
+        self.stats = {}
+
+    def _write_tracemalloc_report(self, snapshot: Any) -> None:
+        statistics = snapshot.statistics("lineno")[:self.tracemalloc_top]
+        with open(str(self.tracemalloc_path), "w") as report_file:
+            report_file.write(f"Top {len(statistics)} allocation sites (pid {os.getpid()})\n")
+            for statistic in statistics:
+                report_file.write(f"{statistic}\n")
+
+
+class NullProfiler(Profiler):
+    """
+        A profiler that records nothing, used when profiling is disabled.
+    """
+
+    def stage(self, name: str) -> ContextManager[None]:  # type: ignore[override]
+        return _NO_OP
+
+    def session(self) -> ContextManager[None]:  # type: ignore[override]
+        return _NO_OP
@@ -0,0 +1,475 @@
+from __future__ import annotations
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Optional, Sequence, cast
+
+if TYPE_CHECKING:
+    import polars as pl
+    from multiprocessing.process import BaseProcess
+    from .duplicate_finder import DuplicateFinder
+
+logger = logging.getLogger(__name__)
+
+
+class WorkQueue(ABC):
+    """
+        Transports shards of contacts from a coordinator to workers, and their results back.
+
+        The coordinator calls `open`, `put` for every shard, `close`, and then `collect`. Workers
+        repeatedly call `get` and report each shard with `complete` or `fail` until `get` returns None.
+
+        Methods:
+        - open(finder): Prepares the queue for a run of the given finder.
+        - put(shard_id, contacts): Enqueues a shard of contacts.
+        - close(): Signals that no more shards will be enqueued.
+        - get(): Claims the next shard, or returns None when no work is left.
+        - complete(shard_id, results): Reports the results of a shard.
+        - fail(shard_id, error): Reports that a shard could not be processed.
+        - collect(shard_ids, workers): Waits for the results of all given shards, raising if a shard is lost
+          because its worker died without reporting it.
+    """
+
+    def open(self, finder: "DuplicateFinder") -> None:
+        """
+        Prepares the queue for a run of the given finder. Does nothing by default.
+
+        Parameters:
+        - finder (DuplicateFinder): The finder that workers use to process shards.
+        """
+
+    @abstractmethod
+    def put(self, shard_id: int, contacts: pl.DataFrame) -> None:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+    @abstractmethod
+    def get(self) -> Optional[tuple[int, pl.DataFrame]]:
+        pass
+
+    @abstractmethod
+    def complete(self, shard_id: int, results: pl.DataFrame) -> None:
+        pass
+
+    @abstractmethod
+    def fail(self, shard_id: int, error: str) -> None:
+        pass
+
+    @abstractmethod
+    def collect(self, shard_ids: list[int], workers: Sequence[BaseProcess] = ()) -> dict[int, pl.DataFrame]:
+        pass
+
+
+class MultiprocessingQueue(WorkQueue):
+    """
+        A work queue backed by `multiprocessing` queues, for workers on the local machine.
+
+        Worker processes are started with the 'spawn' method, which is safe to use alongside
+        the thread pools of Polars and rapidfuzz. Every claimed shard is reported to the coordinator
+        before it is processed, so a shard held by a worker that dies without reporting it (for
+        example when killed for running out of memory) is detected as lost instead of awaited forever.
+
+        Attributes:
+        - poll_interval (float): Seconds to wait for results before checking on the worker processes.
+    """
+
+    _CLOSED = None
+
+    def __init__(self, poll_interval: float = 0.5) -> None:
+        import multiprocessing
+
+        context = multiprocessing.get_context("spawn")
+        self.poll_interval = poll_interval
+        self._shards: Any = context.Queue()
+        self._results: Any = context.Queue()
+        # Unlike Queue, SimpleQueue writes in the calling thread, so a claim is never lost with its worker.
+        self._claims: Any = context.SimpleQueue()
+        self._coordinator_pid = os.getpid()
+
+    def put(self, shard_id: int, contacts: pl.DataFrame) -> None:
+        self._shards.put((shard_id, contacts))
+
+    def close(self) -> None:
+        self._shards.put(self._CLOSED)
+
+    def get(self) -> Optional[tuple[int, pl.DataFrame]]:
+        shard = self._shards.get()
+        if shard is self._CLOSED:
+            # Pass the marker on so every other worker sees it too.
+            self._shards.put(self._CLOSED)
+            return None
+        shard_id, contacts = shard
+        if os.getpid() != self._coordinator_pid:
+            self._claims.put((shard_id, os.getpid()))
+        return shard_id, contacts
+
+    def complete(self, shard_id: int, results: pl.DataFrame) -> None:
+        self._results.put((shard_id, results, None))
+
+    def fail(self, shard_id: int, error: str) -> None:
+        self._results.put((shard_id, None, error))
+
+    def collect(self, shard_ids: list[int], workers: Sequence[BaseProcess] = ()) -> dict[int, pl.DataFrame]:
+        import queue
+
+        collected: dict[int, pl.DataFrame] = {}
+        claims: dict[int, int] = {}
+        workers_exited = False
+        while len(collected) < len(shard_ids):
+            try:
+                shard_id, results, error = self._results.get(timeout=self.poll_interval)
+            except queue.Empty:
+                if workers_exited:
+                    raise RuntimeError(f"All worker processes exited before completing shards "
+                                       f"{_missing(shard_ids, collected)}")
+                while not self._claims.empty():
+                    claimed_id, pid = self._claims.get()
+                    claims[claimed_id] = pid
+                for worker in workers:
+                    if not worker.exitcode:
+                        continue
+                    lost = [claimed_id for claimed_id, pid in claims.items()
+                            if pid == worker.pid and claimed_id not in collected]
+                    if lost:
+                        raise RuntimeError(f"Shard {', '.join(map(str, lost))} was lost: worker process "
+                                           f"{worker.pid} exited with code {worker.exitcode}")
+                # Results sent just before the last worker exited may still be in transit, so poll once more.
+                workers_exited = bool(workers) and all(worker.exitcode is not None for worker in workers)
+                continue
+            if error is not None:
+                raise RuntimeError(f"Shard {shard_id} failed: {error}")
+            collected[shard_id] = results
+        return collected
+
+
+class SpoolQueue(WorkQueue):
+    """
+        A work queue kept in a directory, so workers on any machine sharing the storage can participate.
+
+        Layout of the spool directory:
+        - finder.pkl: The pickled finder used to process shards.
+        - pending/: Shards waiting for a worker, as Parquet files.
+        - claimed/: Shards being processed. A worker claims a shard by atomically renaming it here.
+        - done/: Results of completed shards, and '.error' files describing failed shards.
+        - closed: Marker written once all shards have been enqueued.
+
+        A claim is a lease: while processing a shard, the worker keeps touching its claimed file.
+        A claimed file left untouched for `lease_timeout` seconds, because its worker crashed or its
+        machine went down, is moved back to pending/ by the coordinator or any other worker. Workers
+        keep waiting while shards are claimed, so a returned shard is picked up again.
+
+        Remote workers are started with `python -m match_score_evaluator.sharding <spool_dir>`.
+
+        Attributes:
+        - directory (str): The spool directory.
+        - poll_interval (float): Seconds to wait between checks for new shards or results.
+        - lease_timeout (float): Seconds after which an unrenewed claim expires. It must comfortably exceed
+          the clock skew between the machines sharing the spool directory.
+    """
+
+    FINDER_FILE = "finder.pkl"
+    CLOSED_FILE = "closed"
+
+    def __init__(self, directory: str, poll_interval: float = 0.5, lease_timeout: float = 60.0):
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self.lease_timeout = lease_timeout
+        self._leases: dict[int, threading.Event] = {}
+
+    def open(self, finder: "DuplicateFinder") -> None:
+        for subdirectory in ("pending", "claimed", "done"):
+            path = os.path.join(self.directory, subdirectory)
+            os.makedirs(path, exist_ok=True)
+            if os.listdir(path):
+                raise ValueError(f"Spool directory '{self.directory}' is not empty. Use an empty directory for each run.")
+        if os.path.exists(os.path.join(self.directory, self.CLOSED_FILE)):
+            raise ValueError(f"Spool directory '{self.directory}' is not empty. Use an empty directory for each run.")
+
+        import pickle
+
+        self._write_atomic(os.path.join(self.directory, self.FINDER_FILE), pickle.dumps(finder))
+
+    def load_finder(self) -> "DuplicateFinder":
+        """
+        Loads the finder of the current run, waiting until the coordinator has published it.
+
+        Returns:
+        - DuplicateFinder: The finder used to process shards.
+        """
+        import pickle
+
+        finder_path = os.path.join(self.directory, self.FINDER_FILE)
+        while not os.path.exists(finder_path):
+            time.sleep(self.poll_interval)
+        with open(finder_path, "rb") as finder_file:
+            finder: "DuplicateFinder" = pickle.load(finder_file)
+        return finder
+
+    def put(self, shard_id: int, contacts: pl.DataFrame) -> None:
+        shard_path = self._shard_path("pending", shard_id)
+        contacts.write_parquet(f"{shard_path}.tmp")
+        os.replace(f"{shard_path}.tmp", shard_path)
+
+    def close(self) -> None:
+        self._write_atomic(os.path.join(self.directory, self.CLOSED_FILE), b"")
+
+    def get(self) -> Optional[tuple[int, pl.DataFrame]]:
+        import polars as pl
+
+        pending = os.path.join(self.directory, "pending")
+        while True:
+            self._requeue_expired()
+            # Check for the marker and the claims before listing, so shards enqueued or returned to
+            # pending just before are not missed.
+            closed = os.path.exists(os.path.join(self.directory, self.CLOSED_FILE))
+            claimed = self._list_shards("claimed")
+            for file_name in self._list_shards("pending"):
+                shard_id = int(file_name[len("shard-"):-len(".parquet")])
+                pending_path = os.path.join(pending, file_name)
+                claimed_path = self._shard_path("claimed", shard_id)
+                try:
+                    # Renaming keeps the modification time, so start the lease before claiming.
+                    os.utime(pending_path)
+                    os.rename(pending_path, claimed_path)
+                except FileNotFoundError:
+                    continue  # Claimed by another worker.
+                self._renew_lease(shard_id)
+                return shard_id, pl.read_parquet(claimed_path)
+
+            if closed and not claimed:
+                return None
+            time.sleep(self.poll_interval)
+
+    def complete(self, shard_id: int, results: pl.DataFrame) -> None:
+        import socket
+
+        result_path = self._shard_path("done", shard_id)
+        # Name the temporary file after the worker so concurrent writers never share it.
+        temporary_path = f"{result_path}.{socket.gethostname()}-{os.getpid()}.tmp"
+        results.write_parquet(temporary_path)
+        os.replace(temporary_path, result_path)
+        self._release(shard_id)
+
+    def fail(self, shard_id: int, error: str) -> None:
+        self._write_atomic(f"{self._shard_path('done', shard_id)}.error", error.encode())
+        self._release(shard_id)
+
+    def collect(self, shard_ids: list[int], workers: Sequence[BaseProcess] = ()) -> dict[int, pl.DataFrame]:
+        import polars as pl
+
+        collected: dict[int, pl.DataFrame] = {}
+        workers_exited = False
+        while len(collected) < len(shard_ids):
+            for shard_id in shard_ids:
+                if shard_id in collected:
+                    continue
+                result_path = self._shard_path("done", shard_id)
+                if os.path.exists(f"{result_path}.error"):
+                    with open(f"{result_path}.error") as error_file:
+                        raise RuntimeError(f"Shard {shard_id} failed: {error_file.read()}")
+                if os.path.exists(result_path):
+                    collected[shard_id] = pl.read_parquet(result_path)
+            if len(collected) < len(shard_ids):
+                if workers_exited:
+                    exit_codes = ", ".join(str(worker.exitcode) for worker in workers)
+                    raise RuntimeError(f"All local worker processes exited (exit codes: {exit_codes}) before "
+                                       f"completing shards {_missing(shard_ids, collected)}")
+                self._requeue_expired()
+                # Workers only exit once no shard is pending or claimed, so unless they died, the
+                # results of all shards are present by the next check.
+                workers_exited = bool(workers) and all(worker.exitcode is not None for worker in workers)
+                time.sleep(self.poll_interval)
+        return collected
+
+    def _renew_lease(self, shard_id: int) -> None:
+        """
+        Keeps touching a claimed shard in a background thread until the shard is released.
+        """
+        released = threading.Event()
+        claimed_path = self._shard_path("claimed", shard_id)
+
+        def renew() -> None:
+            while not released.wait(self.lease_timeout / 4):
+                try:
+                    os.utime(claimed_path)
+                except FileNotFoundError:
+                    return  # The claim expired and was returned to pending.
+
+        threading.Thread(target=renew, name=f"lease-shard-{shard_id}", daemon=True).start()
+        self._leases[shard_id] = released
+
+    def _release(self, shard_id: int) -> None:
+        """
+        Stops renewing the lease of a reported shard and removes its claim.
+        """
+        released = self._leases.pop(shard_id, None)
+        if released is not None:
+            released.set()
+        try:
+            os.remove(self._shard_path("claimed", shard_id))
+        except FileNotFoundError:
+            pass
+
+    def _requeue_expired(self) -> None:
+        """
+        Returns shards whose lease has expired to pending, or drops their claim if they were reported.
+        """
+        now = time.time()
+        for file_name in self._list_shards("claimed"):
+            claimed_path = os.path.join(self.directory, "claimed", file_name)
+            result_path = os.path.join(self.directory, "done", file_name)
+            try:
+                if now - os.path.getmtime(claimed_path) < self.lease_timeout:
+                    continue
+                if os.path.exists(result_path) or os.path.exists(f"{result_path}.error"):
+                    os.remove(claimed_path)
+                    continue
+                os.rename(claimed_path, os.path.join(self.directory, "pending", file_name))
+            except FileNotFoundError:
+                continue  # Released, or requeued by another process.
+            logger.warning(f"Lease of {file_name} expired; returned it to pending")
+
+    def _list_shards(self, subdirectory: str) -> list[str]:
+        return sorted(file_name for file_name in os.listdir(os.path.join(self.directory, subdirectory))
+                      if file_name.endswith(".parquet"))
+
+    def _shard_path(self, subdirectory: str, shard_id: int) -> str:
+        return os.path.join(self.directory, subdirectory, f"shard-{shard_id:06d}.parquet")
+
+    @staticmethod
+    def _write_atomic(path: str, content: bytes) -> None:
+        with open(f"{path}.tmp", "wb") as output_file:
+            output_file.write(content)
+        os.replace(f"{path}.tmp", path)
+
+
+def _missing(shard_ids: list[int], collected: dict[int, Any]) -> list[int]:
+    return [shard_id for shard_id in shard_ids if shard_id not in collected]
+
+
+def run_worker(queue: WorkQueue, finder: "DuplicateFinder") -> int:
+    """
+    Processes shards from a work queue until no work is left.
+
+    Parameters:
+    - queue (WorkQueue): The queue to claim shards from and report results to.
+    - finder (DuplicateFinder): The finder used to find duplicates within each shard.
+
+    Returns:
+    - int: The number of shards processed.
+    """
+    import traceback
+
+    processed = 0
+    while (shard := queue.get()) is not None:
+        shard_id, contacts = shard
+        try:
+            results = finder.find_duplicates(contacts)
+        except Exception:
+            logger.error(f"Shard {shard_id} failed")
+            queue.fail(shard_id, traceback.format_exc())
+        else:
+            queue.complete(shard_id, results)
+            logger.info(f"Completed shard {shard_id} ({contacts.height} contacts)")
+        processed += 1
+    return processed
+
+
+def split_into_shards(contacts: pl.DataFrame, block_by: list[str], num_shards: int) -> dict[int, pl.DataFrame]:
+    """
+    Splits contacts into shards so that every block lies entirely within one shard.
+
+    Blocks are assigned to shards by a hash of their block values. Contacts with a null
+    block value are never compared, so they are left out of every shard.
+
+    Parameters:
+    - contacts (pl.DataFrame): The contacts to split.
+    - block_by (list[str]): The block columns.
+    - num_shards (int): The maximum number of shards.
+
+    Returns:
+    - dict[int, pl.DataFrame]: The non-empty shards keyed by shard ID, each keeping the original row order.
+    """
+    import polars as pl
+
+    shard_ids = pl.struct(block_by).hash(seed=0) % num_shards
+    partitions = contacts.drop_nulls(block_by).with_columns(shard_ids.alias("_shard")).partition_by(
+        "_shard", as_dict=True, maintain_order=True
+    )
+    return {cast(int, key[0]): partition.drop("_shard") for key, partition in sorted(partitions.items())}
+
+
+def run_sharded(finder: "DuplicateFinder", contacts: pl.DataFrame, num_shards: int, queue: WorkQueue,
+                num_workers: int) -> pl.DataFrame:
+    """
+    Runs a finder over contacts split into shards, dispatched to workers through a work queue.
+
+    Parameters:
+    - finder (DuplicateFinder): The finder to run. Its block columns determine the shards.
+    - contacts (pl.DataFrame): The contacts to search for duplicates.
+    - num_shards (int): The maximum number of shards.
+    - queue (WorkQueue): The queue used to dispatch shards and gather results.
+    - num_workers (int): The number of local worker processes to start. With 0, shards are processed
+      in the current process, unless external workers drain the queue first.
+
+    Returns:
+    - pl.DataFrame: The results of all shards, concatenated in shard order.
+
+    Raises:
+    - RuntimeError: If a shard fails, or is lost because the local workers died without reporting it.
+    """
+    import multiprocessing
+    import polars as pl
+
+    shards = split_into_shards(contacts, finder.block_by, num_shards)
+
+    queue.open(finder)
+    for shard_id, shard_contacts in shards.items():
+        queue.put(shard_id, shard_contacts)
+    queue.close()
+    logger.info(f"Dispatched {len(shards)} shards to {num_workers} local workers")
+
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=run_worker, args=(queue, finder)) for _ in range(num_workers)]
+    for worker in workers:
+        worker.start()
+    if not workers:
+        run_worker(queue, finder)
+
+    try:
+        results = queue.collect(list(shards), workers)
+    except BaseException:
+        # Unread results could block workers from exiting; stop them instead of waiting.
+        for worker in workers:
+            worker.terminate()
+        raise
+    finally:
+        for worker in workers:
+            worker.join()
+
+    if not results:
+        return finder.find_duplicates(contacts.clear())
+    # Results read back from Parquet may not keep every dtype (an empty Enum column is read back as
+    # Categorical on Polars 1.x), so restore the schema of the run before combining them.
+    schema = finder._result_schema(contacts, contacts)
+    return pl.concat([results[shard_id].cast({column: dtype for column, dtype in schema.items()})
+                      for shard_id in sorted(results)])
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Process shards from a spool directory shared with a coordinator.")
+    parser.add_argument("spool_dir", help="The spool directory of the run.")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="Seconds between checks for new shards.")
+    parser.add_argument("--lease-timeout", type=float, default=60.0,
+                        help="Seconds after which a claim that is no longer renewed expires.")
+    arguments = parser.parse_args()
+
+    spool = SpoolQueue(arguments.spool_dir, arguments.poll_interval, arguments.lease_timeout)
+    run_worker(spool, spool.load_finder())
@@ -1,18 +1,77 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Optional, Sequence, Union
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+    import polars as pl
+
+
 class SimilarityCategorizer:
     """
-        Categorizes similarity scores into predefined accuracy levels: High, Medium, or Low.
+        Categorizes similarity scores into accuracy levels separated by configurable thresholds.
 
         This class provides an intuitive classification of similarity scores, making it easier
-        to interpret the results of contact comparisons.
+        to interpret the results of contact comparisons. By default scores are categorized into
+        Low, Medium (>= 0.6) and High (>= 0.8), but any number of bands can be configured.
+
+        Attributes:
+        - thresholds (tuple[float, ...]): Strictly ascending lower bounds of every band except the first.
+        - labels (tuple[str, ...]): Unique band labels, from the lowest band to the highest.
 
         Methods:
-        - categorize(score): Categorizes a similarity score into High, Medium, or Low.
+        - categorize(score): Categorizes a single similarity score.
+        - categorize_array(scores): Categorizes a whole column of similarity scores at once.
     """
-    @staticmethod
-    def categorize(score: float) -> str:
-        if score >= 0.8:
-            return "High"
-        elif score >= 0.6:
-            return "Medium"
-        else:
-            return "Low"
+
+    def __init__(self, thresholds: Sequence[float] = (0.6, 0.8), labels: Sequence[str] = ("Low", "Medium", "High")):
+        if len(labels) != len(thresholds) + 1:
+            raise ValueError(f"Expected {len(thresholds) + 1} labels for {len(thresholds)} thresholds, "
+                             f"got {len(labels)}")
+        if any(lower >= upper for lower, upper in zip(thresholds, thresholds[1:])):
+            raise ValueError(f"Thresholds must be strictly ascending, got {list(thresholds)}")
+        if len(set(labels)) != len(labels):
+            raise ValueError(f"Labels must be unique, got {list(labels)}")
+
+        self.thresholds = tuple(thresholds)
+        self.labels = tuple(labels)
+        self._bands: Optional[pl.Series] = None
+
+    def categorize(self, score: float) -> str:
+        """
+        Categorizes a similarity score.
+
+        A score belongs to the highest band whose threshold it reaches.
+
+        Parameters:
+        - score (float): The similarity score.
+
+        Returns:
+        - str: The label of the band the score falls into.
+        """
+        return self.labels[sum(score >= threshold for threshold in self.thresholds)]
+
+    def categorize_array(self, scores: Union[pl.Series, npt.ArrayLike]) -> pl.Series:
+        """
+        Categorizes a column of similarity scores in a single vectorized pass.
+
+        Equivalent to a right-sided `searchsorted` of the scores into the thresholds, but
+        computed with one comparison per threshold, which is faster for the handful of
+        bands typically configured.
+
+        Parameters:
+        - scores (pl.Series | np.ndarray): The similarity scores.
+
+        Returns:
+        - pl.Series: An 'Accuracy' Enum column with the label of each score.
+        """
+        import numpy as np
+        import polars as pl
+
+        if self._bands is None:
+            self._bands = pl.Series(self.labels, dtype=pl.Enum(self.labels))
+
+        values = scores.to_numpy() if isinstance(scores, pl.Series) else np.asarray(scores)
+        bands = np.zeros(values.shape, dtype=np.uint32)
+        for threshold in self.thresholds:
+            bands += values >= threshold
+        return self._bands.gather(bands).alias('Accuracy')
@@ -1,12 +1,73 @@
+import threading
+from types import MappingProxyType
+from typing import Iterator, Mapping
 from .strategies import SimilarityStrategy
 
 
+class StrategyRegistry(Mapping[str, SimilarityStrategy]):
+    """
+        An immutable mapping of field names to similarity strategies.
+
+        Unlike the process-wide `SimilarityStrategyFactory`, a registry is an ordinary value:
+        differently configured registries can coexist in one process and be shared between
+        threads safely, since they cannot change once built.
+
+        Methods:
+        - get_strategy(field_type): Retrieves the similarity strategy for a given field.
+        - with_strategy(field_type, strategy): Returns a copy of the registry with one strategy added or replaced.
+    """
+
+    def __init__(self, strategies: Mapping[str, SimilarityStrategy]):
+        self._strategies = MappingProxyType(dict(strategies))
+
+    def __getitem__(self, field_type: str) -> SimilarityStrategy:
+        return self._strategies[field_type]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._strategies)
+
+    def __len__(self) -> int:
+        return len(self._strategies)
+
+    def __reduce__(self) -> tuple[type["StrategyRegistry"], tuple[dict[str, SimilarityStrategy]]]:
+        # MappingProxyType cannot be pickled; rebuild from a plain dict so registries can be sent to workers.
+        return StrategyRegistry, (dict(self._strategies),)
+
+    def get_strategy(self, field_type: str) -> SimilarityStrategy:
+        """
+        Retrieves the similarity strategy for a given field type.
+
+        Parameters:
+        - field_type (str): The name of the field.
+
+        Returns:
+        - SimilarityStrategy: The registered strategy.
+        """
+        if field_type not in self._strategies:
+            raise ValueError(f"No strategy registered for field type: {field_type}")
+        return self._strategies[field_type]
+
+    def with_strategy(self, field_type: str, strategy: SimilarityStrategy) -> "StrategyRegistry":
+        """
+        Creates a new registry with a strategy added or replaced for a field type.
+
+        Parameters:
+        - field_type (str): The name of the field (e.g., 'First Name').
+        - strategy (SimilarityStrategy): An instance of the similarity strategy.
+
+        Returns:
+        - StrategyRegistry: The new registry; this registry is left unchanged.
+        """
+        return StrategyRegistry({**self._strategies, field_type: strategy})
+
+
 class SimilarityStrategyFactory:
     """
         Manages the registration and retrieval of similarity strategies for specific fields.
 
         This class provides a dynamic mechanism to associate fields with their corresponding
-        similarity strategies, enabling flexible and extensible configuration.
+        similarity strategies, enabling flexible and extensible configuration. Registrations are
+        process-wide; `build_registry` takes an immutable snapshot of them for use by a comparator.
 
         Attributes:
         - _strategies (dict[str, SimilarityStrategy]): A dictionary mapping field names to similarity strategies.
@@ -14,9 +75,11 @@ class SimilarityStrategyFactory:
         Methods:
         - register_strategy(field_type, strategy): Registers a similarity strategy for a given field.
         - get_strategy(field_type): Retrieves the registered similarity strategy for a given field.
+        - build_registry(): Returns an immutable snapshot of the registered strategies.
         """
 
     _strategies: dict[str, SimilarityStrategy] = {}
+    _lock = threading.Lock()
 
     @staticmethod
     def register_strategy(field_type: str, strategy: SimilarityStrategy) -> None:
@@ -27,7 +90,8 @@ class SimilarityStrategyFactory:
         - field_type (str): The name of the field (e.g., 'First Name').
         - strategy (SimilarityStrategy): An instance of the similarity strategy.
         """
-        SimilarityStrategyFactory._strategies[field_type] = strategy
+        with SimilarityStrategyFactory._lock:
+            SimilarityStrategyFactory._strategies[field_type] = strategy
 
     @staticmethod
     def get_strategy(field_type: str) -> SimilarityStrategy:
@@ -43,3 +107,14 @@ class SimilarityStrategyFactory:
         if field_type not in SimilarityStrategyFactory._strategies:
             raise ValueError(f"No strategy registered for field type: {field_type}")
         return SimilarityStrategyFactory._strategies[field_type]
+
+    @staticmethod
+    def build_registry() -> StrategyRegistry:
+        """
+        Takes an immutable snapshot of the currently registered strategies.
+
+        Returns:
+        - StrategyRegistry: A registry unaffected by later registrations.
+        """
+        with SimilarityStrategyFactory._lock:
+            return StrategyRegistry(SimilarityStrategyFactory._strategies)
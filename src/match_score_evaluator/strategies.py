@@ -1,36 +1,123 @@
+from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Any, Optional
-from rapidfuzz.distance import Levenshtein, JaroWinkler
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+    import polars as pl
+
+# Scorers used per pair, bound on first use so importing this module does not load rapidfuzz.
+_jaro_winkler_similarity: Optional[Callable[[str, str], float]] = None
+_levenshtein_similarity: Optional[Callable[[str, str], float]] = None
+
+
+def _load_jaro_winkler() -> Callable[[str, str], float]:
+    global _jaro_winkler_similarity
+    from rapidfuzz.distance import JaroWinkler
+
+    _jaro_winkler_similarity = JaroWinkler.similarity
+    return _jaro_winkler_similarity
+
+
+def _load_levenshtein() -> Callable[[str, str], float]:
+    global _levenshtein_similarity
+    from rapidfuzz.distance import Levenshtein
+
+    _levenshtein_similarity = Levenshtein.normalized_similarity
+    return _levenshtein_similarity
 
 
 class SimilarityStrategy(ABC):
+    # Relative cost of scoring one pair, used to evaluate cheap fields first in a cascade.
+    cost: float = 1.0
+
     @abstractmethod
     def calculate(self, value1: Any, value2: Any, column_name: Optional[str] = None) -> float:
         pass
 
+    def calculate_batch(self, values1: pl.Series, values2: pl.Series) -> npt.NDArray[np.float64]:
+        """
+        Calculates the similarity for each aligned pair of values in two columns.
+
+        The default implementation calls `calculate` once per pair; strategies with a
+        vectorized formulation override it.
+
+        Parameters:
+        - values1 (pl.Series): Values of the first contact of each pair.
+        - values2 (pl.Series): Values of the second contact of each pair.
+
+        Returns:
+        - np.ndarray: A float64 array with one similarity score per pair.
+        """
+        import numpy as np
+
+        return np.fromiter(
+            (self.calculate(value1, value2) for value1, value2 in zip(values1.to_list(), values2.to_list())),
+            dtype=np.float64,
+            count=len(values1)
+        )
+
 
 class NameSimilarity(SimilarityStrategy):
+    cost = 1.0
+
     def calculate(self, value1: str, value2: str, column_name: Optional[str] = None) -> float:
         value1 = value1 or ""
         value2 = value2 or ""
-        return JaroWinkler.similarity(value1, value2)
+        return (_jaro_winkler_similarity or _load_jaro_winkler())(value1, value2)
+
+    def calculate_batch(self, values1: pl.Series, values2: pl.Series) -> npt.NDArray[np.float64]:
+        import numpy as np
+        from rapidfuzz import process
+        from rapidfuzz.distance import JaroWinkler
+
+        # Older stubs declare dtype as an np.dtype instance, but rapidfuzz only accepts the scalar type.
+        similarities: npt.NDArray[np.float64] = process.cpdist(  # type: ignore[call-overload, unused-ignore]
+            values1.fill_null("").to_list(), values2.fill_null("").to_list(),
+            scorer=JaroWinkler.normalized_similarity, dtype=np.float64
+        )
+        return similarities
 
 
 class EmailSimilarity(SimilarityStrategy):
+    cost = 1.0
+
     def calculate(self, value1: str, value2: str, column_name: Optional[str] = None) -> float:
         value1 = value1 or ""
         value2 = value2 or ""
-        return Levenshtein.normalized_similarity(value1, value2)
+        return (_levenshtein_similarity or _load_levenshtein())(value1, value2)
+
+    def calculate_batch(self, values1: pl.Series, values2: pl.Series) -> npt.NDArray[np.float64]:
+        import numpy as np
+        from rapidfuzz import process
+        from rapidfuzz.distance import Levenshtein
+
+        # Older stubs declare dtype as an np.dtype instance, but rapidfuzz only accepts the scalar type.
+        similarities: npt.NDArray[np.float64] = process.cpdist(  # type: ignore[call-overload, unused-ignore]
+            values1.fill_null("").to_list(), values2.fill_null("").to_list(),
+            scorer=Levenshtein.normalized_similarity, dtype=np.float64
+        )
+        return similarities
 
 
 class ZipCodeSimilarity(SimilarityStrategy):
+    cost = 0.02
+
     def calculate(self, value1: str, value2: str, column_name: Optional[str] = None) -> float:
         if value1 is None or value2 is None:
             return 0.0
         return 1.0 if value1 == value2 else 0.0
 
+    def calculate_batch(self, values1: pl.Series, values2: pl.Series) -> npt.NDArray[np.float64]:
+        import polars as pl
+
+        return (values1 == values2).fill_null(False).cast(pl.Float64).to_numpy()
+
 
 class AddressSimilarity(SimilarityStrategy):
+    cost = 4.0
+
     def calculate(self, value1: str, value2: str, column_name: Optional[str] = None) -> float:
         value1 = value1 or ""
         value2 = value2 or ""
@@ -1,6 +1,9 @@
-import polars as pl
+from __future__ import annotations
 import os
-from typing import Dict
+from typing import TYPE_CHECKING, Dict
+
+if TYPE_CHECKING:
+    import polars as pl
 
 
 def load_contacts_from_csv(file_path: str, column_mapping: Dict[str, str], delimiter: str = ',',
@@ -24,6 +27,8 @@ def load_contacts_from_csv(file_path: str, column_mapping: Dict[str, str], delim
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File '{file_path}' does not exist. Please check the file path.")
 
+    import polars as pl
+
     try:
         df = pl.read_csv(file_path, separator=delimiter, has_header=has_header)
         return df.rename(column_mapping)
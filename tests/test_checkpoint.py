@@ -0,0 +1,66 @@
+import pytest
+import polars as pl
+from match_score_evaluator.checkpoint import CheckpointManifest
+
+
+FINGERPRINT = {"rows": 3, "unit_size": 2}
+
+
+def test_save_and_load_units(tmp_path):
+    """
+    Test that saved units are recorded and loaded back in unit order.
+    """
+    manifest = CheckpointManifest(str(tmp_path), FINGERPRINT, total_units=2)
+    manifest.save_unit(1, pl.DataFrame({"value": [3]}))
+    manifest.save_unit(0, pl.DataFrame({"value": [1, 2]}))
+
+    assert manifest.is_complete(0) and manifest.is_complete(1), "Expected both units to be complete"
+    assert manifest.load_results()["value"].to_list() == [1, 2, 3], "Expected results in unit order"
+
+
+def test_manifest_is_reloaded(tmp_path):
+    """
+    Test that a new manifest on the same directory picks up completed units.
+    """
+    CheckpointManifest(str(tmp_path), FINGERPRINT, total_units=2).save_unit(0, pl.DataFrame({"value": [1]}))
+
+    manifest = CheckpointManifest(str(tmp_path), FINGERPRINT, total_units=2)
+
+    assert manifest.is_complete(0), "Expected unit 0 to be complete after reloading"
+    assert not manifest.is_complete(1), "Expected unit 1 to be incomplete after reloading"
+
+
+def test_load_results_incomplete(tmp_path):
+    """
+    Test that loading results of an unfinished run raises a ValueError.
+    """
+    manifest = CheckpointManifest(str(tmp_path), FINGERPRINT, total_units=2)
+    manifest.save_unit(0, pl.DataFrame({"value": [1]}))
+
+    with pytest.raises(ValueError, match="1 of 2 work units are incomplete"):
+        manifest.load_results()
+
+
+def test_fingerprint_mismatch(tmp_path):
+    """
+    Test that a checkpoint of a different run is rejected.
+    """
+    CheckpointManifest(str(tmp_path), FINGERPRINT, total_units=2).save_unit(0, pl.DataFrame({"value": [1]}))
+
+    with pytest.raises(ValueError, match="belongs to a different run"):
+        CheckpointManifest(str(tmp_path), {"rows": 4, "unit_size": 2}, total_units=2)
+
+
+def test_load_results_casts_units_to_schema(tmp_path):
+    """
+    Test that units, including empty ones, are cast back to the given schema before they are combined.
+    """
+    accuracy = pl.Enum(["Low", "High"])
+    manifest = CheckpointManifest(str(tmp_path), FINGERPRINT, total_units=2)
+    manifest.save_unit(0, pl.DataFrame({"Accuracy": ["High"]}, schema={"Accuracy": accuracy}))
+    manifest.save_unit(1, pl.DataFrame(schema={"Accuracy": accuracy}))
+
+    results = manifest.load_results({"Accuracy": accuracy})
+
+    assert results.schema["Accuracy"] == accuracy, "Expected the Enum dtype to be restored"
+    assert results["Accuracy"].to_list() == ["High"], "Expected the rows of the non-empty unit"
@@ -1,6 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
 import pytest
+import polars as pl
 from match_score_evaluator.contact_comparator import ContactComparator
-from match_score_evaluator.similarity_factory import SimilarityStrategyFactory
+from match_score_evaluator.similarity_factory import SimilarityStrategyFactory, StrategyRegistry
 from match_score_evaluator.strategies import (
     NameSimilarity,
     EmailSimilarity,
@@ -145,3 +147,136 @@ def test_calculate_score_missing_field():
 
     score = comparator.calculate_score(contact1, contact2)
     assert score < 1.0, f"Expected score to be < 1.0, got {score}"
+
+
+def test_calculate_field_scores_matches_calculate_score():
+    """
+    Test that batch scoring yields the same per-field and total scores as per-pair scoring.
+    """
+    comparator = ContactComparator(weights={
+        'First Name': 0.3,
+        'Last Name': 0.3,
+        'Email Address': 0.2,
+        'Zip Code': 0.1,
+        'Address': 0.1
+    })
+
+    left = pl.DataFrame({
+        'First Name': ['John', 'John'],
+        'Last Name': ['Smith', 'Doe'],
+        'Email Address': ['john.smith@example.com', 'john.doe@example.com'],
+        'Zip Code': ['12345', '12345'],
+        'Address': ['123 Main St', '123 Main St']
+    })
+    right = pl.DataFrame({
+        'First Name': ['Jon', 'John'],
+        'Last Name': ['Doe', None],
+        'Email Address': ['jon.doe@example.com', 'john.doe@example.com'],
+        'Zip Code': ['12345', '12345'],
+        'Address': ['456 Main St', '123 Main St']
+    })
+
+    field_scores = comparator.calculate_field_scores(left, right)
+    scores = comparator.combine_scores(field_scores)
+
+    for index, (contact1, contact2) in enumerate(zip(left.rows(named=True), right.rows(named=True))):
+        similarities = comparator.calculate_field_similarities(contact1, contact2)
+        for field, similarity in similarities.items():
+            assert field_scores[field][index] == pytest.approx(similarity), f"Unexpected batch score for {field}"
+        assert scores[index] == comparator.calculate_score(contact1, contact2), \
+            "Expected batch total score to equal the per-pair score"
+
+
+def test_comparators_with_different_registries():
+    """
+    Test that comparators bound to different registries score independently in concurrent threads.
+    """
+    contact1 = {'First Name': 'John'}
+    contact2 = {'First Name': 'Jon'}
+    name_comparator = ContactComparator({'First Name': 1.0}, StrategyRegistry({'First Name': NameSimilarity()}))
+    zip_comparator = ContactComparator({'First Name': 1.0}, StrategyRegistry({'First Name': ZipCodeSimilarity()}))
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        name_scores = executor.map(lambda _: name_comparator.calculate_score(contact1, contact2), range(100))
+        zip_scores = executor.map(lambda _: zip_comparator.calculate_score(contact1, contact2), range(100))
+
+        assert all(score > 0.9 for score in name_scores), "Expected name similarity for the first comparator"
+        assert all(score == 0.0 for score in zip_scores), "Expected exact matching for the second comparator"
+
+
+def test_comparator_requires_strategy_for_every_field():
+    """
+    Test that a comparator cannot be built for a field without a strategy.
+    """
+    with pytest.raises(ValueError, match="No strategy registered for field type: Phone"):
+        ContactComparator({'Phone': 1.0}, StrategyRegistry({}))
+
+
+def test_calculate_scores_cascade_matches_full_scoring():
+    """
+    Test that the cascade keeps exactly the pairs reaching the threshold, with unchanged scores.
+    """
+    comparator = ContactComparator(weights={
+        'First Name': 0.2,
+        'Last Name': 0.2,
+        'Email Address': 0.4,
+        'Zip Code': 0.1,
+        'Address': 0.1
+    })
+
+    left = pl.DataFrame({
+        'First Name': ['John', 'John', 'Alice', 'John'],
+        'Last Name': ['Doe', 'Doe', 'Smith', 'Doe'],
+        'Email Address': ['john.doe@example.com', 'john.doe@example.com', 'alice@example.com', 'jd@example.com'],
+        'Zip Code': ['12345', '12345', '67890', '12345'],
+        'Address': ['123 Main St', '123 Main St', '456 Elm St', '1 Oak St']
+    })
+    right = pl.DataFrame({
+        'First Name': ['Jon', 'John', 'Bob', 'John'],
+        'Last Name': ['Doe', 'Doe', 'Brown', 'Doe'],
+        'Email Address': ['jon.doe@example.com', 'john.doe@example.com', 'bob@example.org', 'jd@example.com'],
+        'Zip Code': ['12345', '12345', '11111', '54321'],
+        'Address': ['123 Main St', '123 Main St', '9 Pine St', '1 Oak St']
+    })
+    full_scores = comparator.combine_scores(comparator.calculate_field_scores(left, right))
+    threshold = float(full_scores[3])
+
+    result = comparator.calculate_scores_cascade(left, right, threshold)
+
+    assert result.indices.tolist() == [0, 1, 3], "Expected only the pairs reaching the threshold to survive"
+    assert result.scores.tolist() == full_scores[[0, 1, 3]].tolist(), "Expected the scores of full scoring"
+    assert list(result.field_scores) == list(comparator.weights), "Expected field scores in weight order"
+    assert [stage['Field'] for stage in result.stages][0] == 'Zip Code', "Expected the cheapest field first"
+    assert result.stages[0]['Evaluated'] == 4, "Expected the first stage to evaluate every pair"
+    assert sum(stage['Eliminated'] for stage in result.stages) == 1, "Expected one pair to be eliminated"
+    assert result.stages[-1]['Evaluated'] < 4, "Expected the last stage to evaluate the survivors only"
+
+
+def test_calculate_scores_cascade_rejects_negative_weights():
+    """
+    Test that the cascade refuses weights for which partial scores give no upper bound.
+    """
+    comparator = ContactComparator(weights={'First Name': 1.0, 'Zip Code': -0.5})
+    contacts = pl.DataFrame({'First Name': ['John'], 'Zip Code': ['12345']})
+
+    with pytest.raises(ValueError, match="non-negative weights"):
+        comparator.calculate_scores_cascade(contacts, contacts, 0.5)
+
+
+def test_comparator_costs():
+    """
+    Test that costs default to the strategies' estimates and can be configured or calibrated.
+    """
+    weights = {'Zip Code': 0.5, 'Address': 0.5}
+    assert ContactComparator(weights).costs == {'Zip Code': ZipCodeSimilarity.cost, 'Address': AddressSimilarity.cost}
+    assert ContactComparator(weights, costs={'Address': 0.01}).costs['Address'] == 0.01
+
+    with pytest.raises(ValueError, match="unweighted field: Phone"):
+        ContactComparator(weights, costs={'Phone': 1.0})
+
+    comparator = ContactComparator(weights)
+    contacts = pl.DataFrame({'Zip Code': ['12345', '67890'], 'Address': ['123 Main St', '456 Elm St']})
+    costs = comparator.calibrate_costs(contacts, contacts)
+    assert set(costs) == set(weights) and all(cost > 0 for cost in costs.values()), \
+        "Expected a measured cost for every field"
+    assert comparator.costs == costs
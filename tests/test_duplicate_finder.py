@@ -2,6 +2,7 @@ import pytest
 import polars as pl
 from match_score_evaluator.contact_comparator import ContactComparator
 from match_score_evaluator.duplicate_finder import DuplicateFinder
+from match_score_evaluator.similarity_categorizer import SimilarityCategorizer
 from match_score_evaluator.similarity_factory import SimilarityStrategyFactory
 from match_score_evaluator.strategies import (
     NameSimilarity,
@@ -132,3 +133,268 @@ def test_find_duplicates_no_duplicates():
     # All contacts should have low similarity, so the accuracy of all results should be "Low"
     assert results.filter(pl.col("Accuracy") != "Low").shape[0] == 0, \
         "Expected no high or medium similarity pairs"
+
+
+def test_find_duplicates_include_field_scores(sample_contacts):
+    """
+    Test that per-field Float32 score columns are added when requested.
+    """
+    comparator = ContactComparator(weights={
+        'First Name': 0.3,
+        'Last Name': 0.3,
+        'Email Address': 0.2,
+        'Zip Code': 0.1,
+        'Address': 0.1
+    })
+    finder = DuplicateFinder(comparator, include_field_scores=True)
+
+    results = finder.find_duplicates(sample_contacts)
+
+    for field in comparator.weights:
+        assert results.schema[f"{field} Score"] == pl.Float32, f"Expected a Float32 score column for {field}"
+
+    pair = results.filter((pl.col('ContactID Source') == 1001) & (pl.col('ContactID Match') == 1002))
+    assert pair['Zip Code Score'][0] == pytest.approx(1.0), "Expected identical zip codes to score 1.0"
+    assert pair['Address Score'][0] == pytest.approx(1.0), "Expected identical addresses to score 1.0"
+
+
+def test_find_duplicates_omits_field_scores_by_default(sample_contacts):
+    """
+    Test that the default output only contains the pair IDs and accuracy.
+    """
+    comparator = ContactComparator(weights={'First Name': 0.5, 'Last Name': 0.5})
+    finder = DuplicateFinder(comparator)
+
+    results = finder.find_duplicates(sample_contacts)
+
+    assert results.columns == ['ContactID Source', 'ContactID Match', 'Accuracy'], \
+        f"Unexpected result columns: {results.columns}"
+
+
+def test_explain(sample_contacts):
+    """
+    Test that explain breaks down the score of a pair from the last run.
+    """
+    comparator = ContactComparator(weights={
+        'First Name': 0.3,
+        'Last Name': 0.3,
+        'Email Address': 0.2,
+        'Zip Code': 0.1,
+        'Address': 0.1
+    })
+    finder = DuplicateFinder(comparator, include_field_scores=True)
+    results = finder.find_duplicates(sample_contacts)
+
+    explanation = finder.explain(1001, 1002)
+
+    pair = results.filter((pl.col('ContactID Source') == 1001) & (pl.col('ContactID Match') == 1002))
+    assert explanation['Accuracy'] == pair['Accuracy'][0], "Expected explain to agree with the run"
+    assert explanation['Score'] == pytest.approx(sum(explanation['Contributions'].values())), \
+        "Expected the score to be the sum of the field contributions"
+    for field, similarity in explanation['Field Scores'].items():
+        assert pair[f"{field} Score"][0] == pytest.approx(similarity, abs=1e-6), \
+            f"Expected explain to agree with the {field} score column"
+
+
+def test_explain_errors(sample_contacts):
+    """
+    Test that explain rejects calls before a run and unknown contact IDs.
+    """
+    finder = DuplicateFinder(ContactComparator(weights={'First Name': 1.0}))
+
+    with pytest.raises(ValueError, match="Run find_duplicates or link before explaining a match"):
+        finder.explain(1001, 1002)
+
+    finder.find_duplicates(sample_contacts)
+    with pytest.raises(ValueError, match="No contact found with ID: 9999"):
+        finder.explain(1001, 9999)
+
+
+def test_find_duplicates_custom_categorizer(sample_contacts):
+    """
+    Test that find_duplicates uses the configured categorizer.
+    """
+    comparator = ContactComparator(weights={
+        'First Name': 0.3,
+        'Last Name': 0.3,
+        'Email Address': 0.2,
+        'Zip Code': 0.1,
+        'Address': 0.1
+    })
+    categorizer = SimilarityCategorizer(thresholds=[0.9], labels=["Distinct", "Duplicate"])
+    finder = DuplicateFinder(comparator, categorizer=categorizer)
+
+    results = finder.find_duplicates(sample_contacts)
+
+    assert set(results['Accuracy'].to_list()) <= {"Distinct", "Duplicate"}, "Expected custom category labels"
+    assert finder.explain(1001, 1003)['Accuracy'] == "Distinct", "Expected explain to use the custom categorizer"
+
+
+def test_find_duplicates_resumable_matches_find_duplicates(sample_contacts, tmp_path):
+    """
+    Test that a checkpointed run produces exactly the same output as a regular run.
+    """
+    comparator = ContactComparator(weights={
+        'First Name': 0.3,
+        'Last Name': 0.3,
+        'Email Address': 0.2,
+        'Zip Code': 0.1,
+        'Address': 0.1
+    })
+    finder = DuplicateFinder(comparator, include_field_scores=True)
+
+    expected = finder.find_duplicates(sample_contacts)
+    results = finder.find_duplicates_resumable(sample_contacts, str(tmp_path), unit_size=2)
+
+    assert results.write_csv() == expected.write_csv(), "Expected checkpointed output to match find_duplicates"
+    assert (tmp_path / "manifest.json").exists(), "Expected a manifest in the checkpoint directory"
+
+
+def test_find_duplicates_resumable_resumes_after_interruption(sample_contacts, tmp_path, monkeypatch):
+    """
+    Test that an interrupted run resumes without recomputing completed work units.
+    """
+    comparator = ContactComparator(weights={
+        'First Name': 0.3,
+        'Last Name': 0.3,
+        'Email Address': 0.2,
+        'Zip Code': 0.1,
+        'Address': 0.1
+    })
+    finder = DuplicateFinder(comparator)
+    expected = finder.find_duplicates(sample_contacts)
+
+    score_pairs = DuplicateFinder._score_pairs
+    scored_units = []
+
+    def interrupted_score_pairs(self, left_contacts, right_contacts, contact_pairs):
+        if len(scored_units) == 1:
+            raise KeyboardInterrupt
+        scored_units.append(contact_pairs)
+        return score_pairs(self, left_contacts, right_contacts, contact_pairs)
+
+    monkeypatch.setattr(DuplicateFinder, "_score_pairs", interrupted_score_pairs)
+    with pytest.raises(KeyboardInterrupt):
+        finder.find_duplicates_resumable(sample_contacts, str(tmp_path), unit_size=1)
+
+    resumed_units = []
+
+    def counting_score_pairs(self, left_contacts, right_contacts, contact_pairs):
+        resumed_units.append(contact_pairs)
+        return score_pairs(self, left_contacts, right_contacts, contact_pairs)
+
+    monkeypatch.setattr(DuplicateFinder, "_score_pairs", counting_score_pairs)
+    results = finder.find_duplicates_resumable(sample_contacts, str(tmp_path), unit_size=1)
+
+    assert len(resumed_units) == 2, f"Expected only the 2 remaining units to run, got {len(resumed_units)}"
+    assert results.write_csv() == expected.write_csv(), "Expected resumed output to match find_duplicates"
+
+
+def test_find_duplicates_resumable_rejects_different_run(sample_contacts, tmp_path):
+    """
+    Test that a checkpoint directory cannot be reused for a different configuration.
+    """
+    comparator = ContactComparator(weights={'First Name': 0.5, 'Last Name': 0.5})
+    DuplicateFinder(comparator).find_duplicates_resumable(sample_contacts, str(tmp_path), unit_size=2)
+
+    with pytest.raises(ValueError, match="belongs to a different run"):
+        DuplicateFinder(comparator).find_duplicates_resumable(sample_contacts, str(tmp_path), unit_size=1)
+
+
+def test_find_duplicates_block_by(sample_contacts):
+    """
+    Test that only contacts in the same block are compared.
+    """
+    comparator = ContactComparator(weights={'First Name': 0.5, 'Last Name': 0.5})
+    finder = DuplicateFinder(comparator, block_by=['Zip Code'])
+
+    results = finder.find_duplicates(sample_contacts)
+
+    assert results.select('ContactID Source', 'ContactID Match').rows() == [(1001, 1002)], \
+        "Expected only the pair sharing a zip code to be compared"
+
+
+def test_link_compares_only_across_datasets(sample_contacts):
+    """
+    Test that link pairs every left contact with every right contact and never within a dataset.
+    """
+    comparator = ContactComparator(weights={
+        'First Name': 0.3,
+        'Last Name': 0.3,
+        'Email Address': 0.2,
+        'Zip Code': 0.1,
+        'Address': 0.1
+    })
+    finder = DuplicateFinder(comparator)
+    imported = pl.DataFrame({
+        'contactID': [1, 2],
+        'name': ['Johnny', 'Bob'],
+        'name1': ['Doe', 'Brown'],
+        'email': ['john.doe@example.com', 'bob@example.com'],
+        'postalZip': [12345, 11111],
+        'address': ['123 Main St', '1 B St']
+    })
+    mapping = {
+        'contactID': 'Contact ID',
+        'name': 'First Name',
+        'name1': 'Last Name',
+        'email': 'Email Address',
+        'postalZip': 'Zip Code',
+        'address': 'Address'
+    }
+
+    results = finder.link(imported, sample_contacts, left_mapping=mapping, unit_size=1)
+
+    assert results.select('ContactID Source', 'ContactID Match').rows() == [
+        (1, 1001), (1, 1002), (1, 1003), (2, 1001), (2, 1002), (2, 1003)
+    ], "Expected every imported contact to be paired with every master contact"
+    match = results.filter((pl.col('ContactID Source') == 1) & (pl.col('ContactID Match') == 1001))
+    assert match['Accuracy'][0] == "High", "Expected the imported John Doe to match the master John Doe"
+    assert finder.explain(1, 1001)['Accuracy'] == "High", "Expected explain to look up both datasets"
+
+
+def test_link_block_by(sample_contacts):
+    """
+    Test that link only compares contacts in the same block.
+    """
+    comparator = ContactComparator(weights={'First Name': 0.5, 'Last Name': 0.5})
+    finder = DuplicateFinder(comparator, block_by=['Zip Code'])
+    imported = pl.DataFrame({
+        'Contact ID': [1, 2],
+        'First Name': ['Alicia', 'Bob'],
+        'Last Name': ['Smith', 'Brown'],
+        'Zip Code': ['67890', '11111']
+    })
+
+    results = finder.link(imported, sample_contacts)
+
+    assert results.select('ContactID Source', 'ContactID Match').rows() == [(1, 1003)], \
+        "Expected only the pair sharing a zip code to be compared"
+
+
+def test_link_missing_column(sample_contacts):
+    """
+    Test that link rejects a dataset lacking a weighted column.
+    """
+    finder = DuplicateFinder(ContactComparator(weights={'First Name': 0.5, 'Last Name': 0.5}))
+    imported = pl.DataFrame({'Contact ID': [1], 'First Name': ['John']})
+
+    with pytest.raises(ValueError, match="Missing required columns: Last Name"):
+        finder.link(imported, sample_contacts)
+
+
+def test_find_duplicates_min_score(sample_contacts):
+    """
+    Test that a minimum score reports the same pairs as filtering the full results, and records cascade stats.
+    """
+    comparator = ContactComparator(weights={'First Name': 0.3, 'Last Name': 0.3, 'Zip Code': 0.2, 'Address': 0.2})
+    full_results = DuplicateFinder(comparator, include_field_scores=True).find_duplicates(sample_contacts)
+    finder = DuplicateFinder(comparator, include_field_scores=True, min_score=0.5)
+
+    results = finder.find_duplicates(sample_contacts)
+
+    assert results.rows() == full_results.filter(pl.col('ContactID Match') == 1002).rows(), \
+        "Expected only the similar pair, with unchanged accuracy and field scores"
+    assert finder.cascade_stats[0]['Field'] == 'Zip Code', "Expected the cheapest field first"
+    assert finder.cascade_stats[0]['Evaluated'] == 3, "Expected the first stage to evaluate every pair"
+    assert sum(stage['Eliminated'] for stage in finder.cascade_stats) == 2, "Expected two pairs to be eliminated"
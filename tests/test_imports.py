@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+import pytest
+
+
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+MODULES = [
+    "match_score_evaluator.checkpoint",
+    "match_score_evaluator.contact_comparator",
+    "match_score_evaluator.duplicate_finder",
+    "match_score_evaluator.feature_store",
+    "match_score_evaluator.profiling",
+    "match_score_evaluator.sharding",
+    "match_score_evaluator.similarity_categorizer",
+    "match_score_evaluator.similarity_factory",
+    "match_score_evaluator.strategies",
+    "match_score_evaluator.utils.data_loader"
+]
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_import_is_lazy_and_side_effect_free(module):
+    """
+    Test that importing a module loads no heavy dependencies and leaves logging unconfigured.
+    """
+    check = (
+        f"import logging, sys, {module}; "
+        f"print(sorted(name for name in ('polars', 'numpy', 'rapidfuzz') if name in sys.modules)); "
+        f"print(logging.getLogger().handlers)"
+    )
+    completed = subprocess.run([sys.executable, "-c", check], env={**os.environ, "PYTHONPATH": SOURCE_DIR},
+                               capture_output=True, text=True, check=True)
+
+    loaded_dependencies, root_handlers = completed.stdout.splitlines()
+    assert loaded_dependencies == "[]", f"Expected no heavy dependencies after importing {module}"
+    assert root_handlers == "[]", f"Expected importing {module} not to configure logging"
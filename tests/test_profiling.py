@@ -0,0 +1,81 @@
+import pstats
+import pytest
+import polars as pl
+from match_score_evaluator.contact_comparator import ContactComparator
+from match_score_evaluator.duplicate_finder import DuplicateFinder
+from match_score_evaluator.profiling import NullProfiler, Profiler
+from match_score_evaluator.similarity_factory import StrategyRegistry
+from match_score_evaluator.strategies import NameSimilarity, ZipCodeSimilarity
+
+
+@pytest.fixture
+def finder_and_contacts():
+    """
+    Fixture to provide a finder and contacts to profile.
+    """
+    registry = StrategyRegistry({'First Name': NameSimilarity(), 'Zip Code': ZipCodeSimilarity()})
+    comparator = ContactComparator({'First Name': 0.5, 'Zip Code': 0.5}, registry)
+    contacts = pl.DataFrame({
+        'Contact ID': [1, 2, 3],
+        'First Name': ['John', 'Jon', 'Alice'],
+        'Zip Code': ['12345', '12345', '67890']
+    })
+    return comparator, contacts
+
+
+def test_stage_records_measurements():
+    """
+    Test that stages accumulate calls, wall and CPU time.
+    """
+    profiler = Profiler()
+
+    for _ in range(2):
+        with profiler.stage("work"):
+            sum(range(10000))
+
+    stats = profiler.stats["work"]
+    assert stats.calls == 2, f"Expected 2 calls, got {stats.calls}"
+    assert stats.wall_time > 0 and stats.cpu_time >= 0, "Expected positive timings"
+    assert stats.net_memory is None, "Expected no traced memory without tracemalloc"
+    assert "work" in profiler.report(), "Expected the stage in the report"
+
+
+def test_null_profiler_records_nothing():
+    """
+    Test that the null profiler accepts stages and sessions without recording anything.
+    """
+    profiler = NullProfiler()
+
+    with profiler.session(), profiler.stage("work"):
+        pass
+
+    assert profiler.stats == {}, "Expected no measurements"
+
+
+def test_finder_records_stages_and_strategies(finder_and_contacts):
+    """
+    Test that a profiled run records its pipeline stages and each strategy.
+    """
+    comparator, contacts = finder_and_contacts
+    profiler = Profiler()
+
+    DuplicateFinder(comparator, profiler=profiler).find_duplicates(contacts)
+
+    for stage in ("pairing", "gather", "scoring", "combine", "categorize", "results",
+                  "strategy: First Name (NameSimilarity)", "strategy: Zip Code (ZipCodeSimilarity)"):
+        assert profiler.stats[stage].calls == 1, f"Expected stage '{stage}' to be recorded once"
+
+
+def test_session_writes_reports(finder_and_contacts, tmp_path):
+    """
+    Test that a session wraps the run in cProfile and tracemalloc and writes both reports.
+    """
+    comparator, contacts = finder_and_contacts
+    profiler = Profiler(cprofile_path=str(tmp_path / "run.prof"), tracemalloc_path=str(tmp_path / "memory.txt"))
+
+    DuplicateFinder(comparator, profiler=profiler).find_duplicates(contacts)
+
+    function_names = {function[2] for function in pstats.Stats(str(tmp_path / "run.prof")).stats}
+    assert "calculate_batch" in function_names, "Expected the strategies to be profiled"
+    assert (tmp_path / "memory.txt").read_text().startswith("Top"), "Expected a tracemalloc report"
+    assert profiler.stats["scoring"].net_memory is not None, "Expected traced memory during the session"
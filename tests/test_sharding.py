@@ -0,0 +1,211 @@
+import os
+import pytest
+import polars as pl
+from match_score_evaluator.contact_comparator import ContactComparator
+from match_score_evaluator.duplicate_finder import DuplicateFinder
+from match_score_evaluator.sharding import MultiprocessingQueue, SpoolQueue, run_worker, split_into_shards
+from match_score_evaluator.similarity_factory import StrategyRegistry
+from match_score_evaluator.strategies import (
+    SimilarityStrategy,
+    NameSimilarity,
+    EmailSimilarity,
+    ZipCodeSimilarity,
+    AddressSimilarity
+)
+
+
+REGISTRY = StrategyRegistry({
+    'First Name': NameSimilarity(),
+    'Last Name': NameSimilarity(),
+    'Email Address': EmailSimilarity(),
+    'Zip Code': ZipCodeSimilarity(),
+    'Address': AddressSimilarity()
+})
+
+WEIGHTS = {
+    'First Name': 0.3,
+    'Last Name': 0.3,
+    'Email Address': 0.2,
+    'Zip Code': 0.1,
+    'Address': 0.1
+}
+
+
+class FailingSimilarity(SimilarityStrategy):
+    def calculate(self, value1, value2, column_name=None):
+        raise RuntimeError("Strategy failure")
+
+
+class CrashingSimilarity(SimilarityStrategy):
+    def calculate(self, value1, value2, column_name=None):
+        os._exit(9)
+
+
+@pytest.fixture
+def contacts():
+    """
+    Fixture to provide contacts spread over several zip code blocks.
+    """
+    return pl.DataFrame({
+        'Contact ID': list(range(1, 13)),
+        'First Name': ['John', 'Jon', 'Alice', 'Alicia', 'Bob', 'Rob', 'Eve', 'Eva', 'Tom', 'Tim', 'Ann', 'Anna'],
+        'Last Name': ['Doe', 'Doe', 'Smith', 'Smith', 'Brown', 'Brown', 'Stone', 'Stone', 'Hill', 'Hill', 'Lee', 'Li'],
+        'Email Address': [f"user{index}@example.com" for index in range(1, 13)],
+        'Zip Code': ['111', '111', '222', '222', '333', '333', '111', '222', '444', '444', None, None],
+        'Address': ['1 Main St'] * 12
+    })
+
+
+def sort_pairs(results):
+    return results.sort(['ContactID Source', 'ContactID Match'])
+
+
+def test_split_into_shards_keeps_blocks_together(contacts):
+    """
+    Test that every block lies in exactly one shard and contacts without a block are dropped.
+    """
+    shards = split_into_shards(contacts, ['Zip Code'], num_shards=3)
+
+    zip_codes = [set(shard['Zip Code'].to_list()) for shard in shards.values()]
+    assert sum(len(codes) for codes in zip_codes) == 4, "Expected each block to be assigned to a single shard"
+    assert sum(shard.height for shard in shards.values()) == 10, "Expected contacts without a block to be dropped"
+
+
+def test_find_duplicates_sharded_in_process(contacts):
+    """
+    Test that sharded results processed in the current process match an unsharded run.
+    """
+    finder = DuplicateFinder(ContactComparator(WEIGHTS, REGISTRY), block_by=['Zip Code'])
+
+    expected = finder.find_duplicates(contacts)
+    results = finder.find_duplicates_sharded(contacts, num_shards=3, num_workers=0)
+
+    assert sort_pairs(results).equals(sort_pairs(expected)), "Expected sharded results to match find_duplicates"
+
+
+def test_find_duplicates_sharded_worker_processes(contacts):
+    """
+    Test that sharded results processed by local worker processes match an unsharded run.
+    """
+    finder = DuplicateFinder(ContactComparator(WEIGHTS, REGISTRY), include_field_scores=True, block_by=['Zip Code'])
+
+    expected = finder.find_duplicates(contacts)
+    results = finder.find_duplicates_sharded(contacts, num_shards=4, queue=MultiprocessingQueue(), num_workers=2)
+
+    assert sort_pairs(results).equals(sort_pairs(expected)), "Expected sharded results to match find_duplicates"
+
+
+def test_find_duplicates_sharded_spool(contacts, tmp_path):
+    """
+    Test a run through a spool directory served by a local worker process.
+    """
+    finder = DuplicateFinder(ContactComparator(WEIGHTS, REGISTRY), block_by=['Zip Code'])
+    expected = finder.find_duplicates(contacts)
+
+    results = finder.find_duplicates_sharded(contacts, num_shards=3, queue=SpoolQueue(str(tmp_path), 0.01),
+                                             num_workers=1)
+
+    assert sort_pairs(results).equals(sort_pairs(expected)), "Expected spooled results to match find_duplicates"
+    assert not list((tmp_path / "pending").iterdir()), "Expected all shards to be claimed"
+
+    with pytest.raises(ValueError, match="is not empty"):
+        finder.find_duplicates_sharded(contacts, num_shards=3, queue=SpoolQueue(str(tmp_path)), num_workers=0)
+
+
+def test_spool_worker_loads_published_finder(contacts, tmp_path):
+    """
+    Test that a worker joining through the spool directory processes shards with the published finder.
+    """
+    finder = DuplicateFinder(ContactComparator(WEIGHTS, REGISTRY), block_by=['Zip Code'])
+    coordinator = SpoolQueue(str(tmp_path), 0.01)
+    coordinator.open(finder)
+    coordinator.put(0, contacts)
+    coordinator.close()
+
+    worker = SpoolQueue(str(tmp_path), 0.01)
+    assert run_worker(worker, worker.load_finder()) == 1, "Expected the worker to process the single shard"
+    assert coordinator.collect([0])[0].equals(finder.find_duplicates(contacts)), \
+        "Expected the worker to produce the same results as the coordinator's finder"
+
+
+def test_find_duplicates_sharded_worker_failure(contacts):
+    """
+    Test that a failing shard is reported to the coordinator.
+    """
+    registry = REGISTRY.with_strategy('Address', FailingSimilarity())
+    finder = DuplicateFinder(ContactComparator(WEIGHTS, registry), block_by=['Zip Code'])
+
+    with pytest.raises(RuntimeError, match="Strategy failure"):
+        finder.find_duplicates_sharded(contacts, num_shards=2, num_workers=0)
+
+
+def test_find_duplicates_sharded_requires_block_by(contacts):
+    """
+    Test that sharding without block columns is rejected.
+    """
+    finder = DuplicateFinder(ContactComparator(WEIGHTS, REGISTRY))
+
+    with pytest.raises(ValueError, match="requires block_by"):
+        finder.find_duplicates_sharded(contacts, num_shards=2)
+
+
+def test_find_duplicates_sharded_worker_exits_hard(contacts):
+    """
+    Test that a shard held by a worker process that dies without reporting it is reported as lost.
+    """
+    registry = REGISTRY.with_strategy('Address', CrashingSimilarity())
+    finder = DuplicateFinder(ContactComparator(WEIGHTS, registry), block_by=['Zip Code'])
+
+    with pytest.raises(RuntimeError, match="was lost: worker process [0-9]+ exited with code 9"):
+        finder.find_duplicates_sharded(contacts, num_shards=2, queue=MultiprocessingQueue(0.05), num_workers=1)
+
+
+def test_find_duplicates_sharded_spool_worker_exits_hard(contacts, tmp_path):
+    """
+    Test that a spooled run fails instead of waiting forever once its local workers have died.
+    """
+    registry = REGISTRY.with_strategy('Address', CrashingSimilarity())
+    finder = DuplicateFinder(ContactComparator(WEIGHTS, registry), block_by=['Zip Code'])
+    queue = SpoolQueue(str(tmp_path), 0.01, lease_timeout=0.2)
+
+    with pytest.raises(RuntimeError, match=r"All local worker processes exited \(exit codes: 9\)"):
+        finder.find_duplicates_sharded(contacts, num_shards=2, queue=queue, num_workers=1)
+
+
+def test_spool_requeues_expired_claims(contacts, tmp_path):
+    """
+    Test that a shard claimed by a worker that stopped renewing its lease is processed by another worker.
+    """
+    finder = DuplicateFinder(ContactComparator(WEIGHTS, REGISTRY), block_by=['Zip Code'])
+    coordinator = SpoolQueue(str(tmp_path), 0.01, lease_timeout=0.2)
+    coordinator.open(finder)
+    coordinator.put(0, contacts)
+    coordinator.close()
+
+    # A crashed worker leaves its claim behind without renewing it.
+    claimed_path = tmp_path / "claimed" / "shard-000000.parquet"
+    (tmp_path / "pending" / "shard-000000.parquet").rename(claimed_path)
+    os.utime(claimed_path, (0, 0))
+
+    worker = SpoolQueue(str(tmp_path), 0.01, lease_timeout=0.2)
+    assert run_worker(worker, worker.load_finder()) == 1, "Expected the expired shard to be processed again"
+    assert coordinator.collect([0])[0].equals(finder.find_duplicates(contacts)), \
+        "Expected the results of the requeued shard"
+    assert not list((tmp_path / "claimed").iterdir()), "Expected the claim to be released"
+
+
+def test_find_duplicates_sharded_spool_shard_without_pairs(tmp_path):
+    """
+    Test that spooled shards without any pair are combined with the others.
+    """
+    contacts = pl.DataFrame({
+        'Contact ID': [1, 2, 3, 4],
+        'First Name': ['John', 'Jon', 'Alice', 'Bob'],
+        'Zip Code': ['1', '1', '2', '3']
+    })
+    finder = DuplicateFinder(ContactComparator({'First Name': 1.0}, REGISTRY), block_by=['Zip Code'])
+
+    results = finder.find_duplicates_sharded(contacts, num_shards=3, queue=SpoolQueue(str(tmp_path), 0.01),
+                                             num_workers=0)
+
+    assert results.equals(finder.find_duplicates(contacts)), "Expected only the pair sharing a zip code"
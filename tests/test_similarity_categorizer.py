@@ -0,0 +1,56 @@
+import pytest
+import numpy as np
+import polars as pl
+from match_score_evaluator.similarity_categorizer import SimilarityCategorizer
+
+
+def test_categorize_default_thresholds():
+    """
+    Test that the default categorizer uses the High/Medium/Low bands.
+    """
+    categorizer = SimilarityCategorizer()
+
+    assert categorizer.categorize(0.95) == "High", "Expected High for scores >= 0.8"
+    assert categorizer.categorize(0.8) == "High", "Expected the threshold itself to belong to the upper band"
+    assert categorizer.categorize(0.7) == "Medium", "Expected Medium for scores >= 0.6"
+    assert categorizer.categorize(0.59) == "Low", "Expected Low for scores < 0.6"
+
+
+def test_categorize_custom_bands():
+    """
+    Test a categorizer configured with a different number of bands.
+    """
+    categorizer = SimilarityCategorizer(thresholds=[0.5, 0.7, 0.9], labels=["D", "C", "B", "A"])
+
+    assert [categorizer.categorize(score) for score in (0.1, 0.5, 0.75, 0.9)] == ["D", "C", "B", "A"], \
+        "Unexpected categories for custom bands"
+
+
+def test_categorize_array_matches_categorize():
+    """
+    Test that array categorization agrees with scalar categorization for NumPy and Polars inputs.
+    """
+    categorizer = SimilarityCategorizer()
+    scores = [0.0, 0.59, 0.6, 0.79, 0.8, 1.0]
+    expected = [categorizer.categorize(score) for score in scores]
+
+    from_numpy = categorizer.categorize_array(np.array(scores))
+    from_polars = categorizer.categorize_array(pl.Series(scores))
+
+    assert from_numpy.to_list() == expected, "Unexpected categories for a NumPy array"
+    assert from_polars.to_list() == expected, "Unexpected categories for a Polars Series"
+    assert from_numpy.name == "Accuracy", "Expected the result to be named 'Accuracy'"
+
+
+def test_categorizer_rejects_invalid_configuration():
+    """
+    Test that inconsistent thresholds and labels are rejected.
+    """
+    with pytest.raises(ValueError, match="Expected 3 labels for 2 thresholds"):
+        SimilarityCategorizer(thresholds=[0.6, 0.8], labels=["Low", "High"])
+
+    with pytest.raises(ValueError, match="Thresholds must be strictly ascending"):
+        SimilarityCategorizer(thresholds=[0.8, 0.6])
+
+    with pytest.raises(ValueError, match="Labels must be unique"):
+        SimilarityCategorizer(labels=["Low", "Low", "High"])
@@ -1,5 +1,5 @@
 import pytest
-from match_score_evaluator.similarity_factory import SimilarityStrategyFactory
+from match_score_evaluator.similarity_factory import SimilarityStrategyFactory, StrategyRegistry
 from match_score_evaluator.strategies import (
     SimilarityStrategy,
     NameSimilarity,
@@ -53,3 +53,39 @@ def test_overwrite_registered_strategy():
 
     assert isinstance(initial_strategy, NameSimilarity), "Expected initial strategy to be NameSimilarity"
     assert isinstance(new_strategy, EmailSimilarity), "Expected new strategy to be EmailSimilarity after overwrite"
+
+
+def test_build_registry_is_a_snapshot():
+    """
+    Test that a built registry is unaffected by later registrations.
+    """
+    SimilarityStrategyFactory.register_strategy('First Name', NameSimilarity())
+    registry = SimilarityStrategyFactory.build_registry()
+
+    SimilarityStrategyFactory.register_strategy('First Name', EmailSimilarity())
+
+    assert isinstance(registry.get_strategy('First Name'), NameSimilarity), \
+        "Expected the registry to keep the strategy registered when it was built"
+
+
+def test_registry_is_immutable():
+    """
+    Test that a registry cannot be modified and with_strategy returns a new registry.
+    """
+    registry = StrategyRegistry({'First Name': NameSimilarity()})
+    extended = registry.with_strategy('Email Address', EmailSimilarity())
+
+    with pytest.raises(TypeError):
+        registry['Email Address'] = EmailSimilarity()
+
+    assert 'Email Address' not in registry, "Expected the original registry to be unchanged"
+    assert isinstance(extended.get_strategy('Email Address'), EmailSimilarity), \
+        "Expected the new registry to contain the added strategy"
+
+
+def test_registry_get_strategy_not_registered():
+    """
+    Test that requesting an unregistered strategy from a registry raises a ValueError.
+    """
+    with pytest.raises(ValueError, match="No strategy registered for field type: Unregistered Field"):
+        StrategyRegistry({}).get_strategy('Unregistered Field')
@@ -1,4 +1,5 @@
 import pytest
+import polars as pl
 from match_score_evaluator.strategies import (
     NameSimilarity,
     EmailSimilarity,
@@ -94,3 +95,17 @@ def test_address_similarity():
         "Expected 0 similarity for None and an address"
     assert strategy.calculate("", "") == pytest.approx(0.0), \
         "Expected 0 similarity for two empty addresses"
+
+
+def test_calculate_batch_matches_calculate():
+    """
+    Test that the batch implementation of every strategy matches its per-pair implementation.
+    """
+    values1 = pl.Series(["John", "123 Main St", None, "", "12345"])
+    values2 = pl.Series(["Jon", "456 Main St", "Doe", "", "12345"])
+
+    for strategy in (NameSimilarity(), EmailSimilarity(), ZipCodeSimilarity(), AddressSimilarity()):
+        expected = [strategy.calculate(value1, value2)
+                    for value1, value2 in zip(values1.to_list(), values2.to_list())]
+        assert strategy.calculate_batch(values1, values2).tolist() == pytest.approx(expected), \
+            f"Expected batch scores of {type(strategy).__name__} to match per-pair scores"